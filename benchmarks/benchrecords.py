@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Benchmark the per-file cost of the match records: a pathlib.Path per file
+(as before) against PFLMatch records sharing the parent path of their folder.
+Measures the time to list and format all files of a generated tree, and the
+memory held by the data lists of all files (traced by tracemalloc).
+"""
+
+# standard imports
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+# local imports
+import pfllib.pflargparse as pflargparse  # noqa: E402
+import pfllib.pflparams as pflparams  # noqa: E402
+from pfli import PFLRunFileInfo  # noqa: E402
+
+
+class PFLRunFileInfoPathPerFile(PFLRunFileInfo):
+    """File information run creating a pathlib.Path per matching file."""
+
+    def handleDir(self, dirPath, files, dirInfo):
+        for entry in files:
+            try:
+                stat = entry.stat()
+            except OSError:
+                stat = None
+            self.handleMatch(pathlib.Path(entry.path), stat)
+
+
+def createTree(basePath, folders, filesPerFolder):
+    for folderNo in range(folders):
+        folder = basePath / f"folder{folderNo}"
+        folder.mkdir()
+        for fileNo in range(filesPerFolder):
+            (folder / f"file{fileNo}.txt").touch()
+
+
+def measureTime(runClass, params, repeat):
+    """Return the best time in seconds to list and format all files."""
+    best = None
+    for _ in range(repeat):
+        run = runClass(params)
+        startTime = time.perf_counter()
+        for dataList in run.iterMatches():
+            run.formatListStrings(dataList)
+        duration = time.perf_counter() - startTime
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def measureMemory(runClass, params):
+    """Return the number of files and the memory in bytes held by their data lists."""
+    run = runClass(params)
+    tracemalloc.start()
+    try:
+        dataLists = list(run.iterMatches())
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return len(dataLists), held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--folders", type=int, default=200)
+    parser.add_argument("--files", type=int, default=100, help="files per folder")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        createTree(pathlib.Path(tempDir), args.folders, args.files)
+        params = pflparams.PFLParams(
+            pflargparse.PFLArgParseWUserPattern("").parse_args(
+                ["*", tempDir, "-r"]
+            )
+        )
+
+        for label, runClass in (
+            ("Path per file", PFLRunFileInfoPathPerFile),
+            ("PFLMatch", PFLRunFileInfo),
+        ):
+            duration = measureTime(runClass, params, args.repeat)
+            countFiles, held = measureMemory(runClass, params)
+            print(
+                "{0:<14} {1:8.2f} us/file {2:8.0f} bytes/file ({3} files)".format(
+                    label,
+                    1e6 * duration / countFiles,
+                    held / countFiles,
+                    countFiles,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
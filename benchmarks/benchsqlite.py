@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Benchmark the SQLite write path: a SELECT of the row ID per file followed
+by separate inserts and updates (as before) against one INSERT ... ON CONFLICT
+DO UPDATE per batch. Measures writing generated file rows into a new database
+and again into the database holding all of them (update run), with the
+SQLite settings of the given profile.
+"""
+
+# standard imports
+import argparse
+import datetime
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+# local imports
+import pfllib.pfloutsqlite as pfloutsqlite  # noqa: E402
+import pfllib.pfsql as pfsql  # noqa: E402
+
+COLUMNS = ["path", "filename", "size", "ctime", "wtime"]
+
+
+class PFLOutSqliteRowID(pfloutsqlite.PFLOutSqlite):
+    """SQLite output selecting the row ID of each file to decide between insert
+    and update.
+    """
+
+    def __init__(self, filePath, columnNames, basePath, profile):
+        super().__init__(filePath, columnNames, basePath, profile=profile)
+        tableName = self._tableName
+        columns = self._columnNames[:-1]
+        self._updateCmd = f"UPDATE {tableName} SET {'=?, '.join(columns)}=? WHERE id=?"
+        self._insertCmd = (
+            f"INSERT INTO {tableName}({', '.join(self._columnNames)})"
+            + f" VALUES ({(len(self._columnNames) * '?, ').strip(', ')})"
+        )
+
+    def writeMatch(self, formattedList):
+        if not formattedList[0] == self._currentPath:
+            self._currentPathID = self.insertPath(
+                self.relativePath(formattedList[0])
+            )
+            self._currentPath = formattedList[0]
+
+        fileID = pfsql.getrowid(
+            self._db,
+            self._tableName,
+            f"path={self._currentPathID} AND filename='{formattedList[1]}'",
+        )
+
+        formattedList[0] = self._currentPathID
+
+        if fileID is None:
+            formattedList.extend([1, self._runID, None])
+            self._dataSets.append([-1, formattedList])
+        else:
+            formattedList.extend([0, self._runID, fileID[0]])
+            self._dataSets.append([fileID[0], formattedList])
+
+        if len(self._dataSets) == 50:
+            self.executeInsertUpdateFiles()
+
+    def executeInsertUpdateFiles(self):
+        inserts = [i for (rowID, i) in self._dataSets if rowID == -1]
+        updates = [i for (rowID, i) in self._dataSets if rowID != -1]
+        if len(inserts) > 0:
+            self._db[1].executemany(self._insertCmd, inserts)
+        if len(updates) > 0:
+            self._db[1].executemany(self._updateCmd, updates)
+        self._countUncommitted += len(self._dataSets)
+        if self._commitRows > 0 and self._countUncommitted >= self._commitRows:
+            self._db[0].commit()
+            self._countUncommitted = 0
+        self._dataSets = []
+        self._dirInfos = []
+
+
+def iterRows(basePath, files, filesPerFolder):
+    """Yield the formatted lists of the generated files."""
+    fileTime = datetime.datetime(2023, 7, 15)
+    for fileNo in range(files):
+        yield [
+            f"{basePath}/folder{fileNo // filesPerFolder}",
+            f"file{fileNo % filesPerFolder}.txt",
+            fileNo,
+            fileTime,
+            fileTime,
+        ]
+
+
+def writeRows(outClass, dbPath, mode, basePath, files, filesPerFolder, profile):
+    """Return the time in seconds to write all rows into the database."""
+    startTime = time.perf_counter()
+    pflout = outClass(dbPath, COLUMNS, basePath, profile=profile)
+    pflout.openout(mode)
+    for formattedList in iterRows(basePath, files, filesPerFolder):
+        pflout.writeMatch(formattedList)
+    pflout.flushMatches()
+    pflout.close()
+    return time.perf_counter() - startTime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000000)
+    parser.add_argument(
+        "--folder-files", type=int, default=100, help="files per folder"
+    )
+    parser.add_argument(
+        "--profile", choices=list(pfloutsqlite.PFLOutSqlite.PROFILES), default="default"
+    )
+    args = parser.parse_args()
+
+    basePath = "/base"
+    with tempfile.TemporaryDirectory() as tempDir:
+        fullPath = pathlib.Path(tempDir) / "full.db"
+        writeRows(
+            pfloutsqlite.PFLOutSqlite,
+            fullPath,
+            "w",
+            basePath,
+            args.files,
+            args.folder_files,
+            args.profile,
+        )
+
+        for label, outClass in (
+            ("SELECT id", PFLOutSqliteRowID),
+            ("UPSERT", pfloutsqlite.PFLOutSqlite),
+        ):
+            newDuration = writeRows(
+                outClass,
+                pathlib.Path(tempDir) / "new.db",
+                "w",
+                basePath,
+                args.files,
+                args.folder_files,
+                args.profile,
+            )
+            dbPath = pathlib.Path(tempDir) / "update.db"
+            shutil.copyfile(fullPath, dbPath)
+            updateDuration = writeRows(
+                outClass,
+                dbPath,
+                "a",
+                basePath,
+                args.files,
+                args.folder_files,
+                args.profile,
+            )
+            print(
+                "{0:<10} new {1:7.2f} s, update {2:7.2f} s ({3} files)".format(
+                    label, newDuration, updateDuration, args.files
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
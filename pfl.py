@@ -10,52 +10,50 @@ __date__ = "07/15/2023"
 and print results to stdout, save as a CSV file or write to a sqlite3 database.
 """
 
+# standard imports
+import sys
+
 # local imports
 import pfllib.pflargparse as pflargparse
 import pfllib.pflparams as pflparams
 import pfllib.pflrun as pflrun
 
 
-class PFLRunFileName(pflrun.PFLRun):
-    """Derived class for scanning and storage of file path and name."""
-
-    def __init__(self, params):
-        super().__init__(params)
-        self.Columns = ["path", "filename"]
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = pflargparse.PFLArgParseWUserPattern(
+        description="List files matching a pattern in a directory and its"
+        + " sub-directories\n"
+        + "and print the results to stdout, or save as a CSV or database file."
+    )
+    args = parser.parse_args()
 
-    def getMatchDataList(self, match):
-        """Return list with data from the match."""
-        return [match.parent, match.name]
+    try:
+        # create parameter object
+        params = pflparams.PFLParams(args)
 
+        print(
+            "Search for files matching '{0}' in directory '{1}'...".format(
+                args.pattern, params.ScanPath
+            ),
+            file=params.StatusOut,
+        )
 
-# define and collect commandline arguments
-# (kept outside try-catch block to leave exception messages untouched)
-parser = pflargparse.PFLArgParseWUserPattern(
-    description="List files matching a pattern in a directory and its sub-directories\n"
-    + "and print the results to stdout, or save as a CSV or database file."
-)
-args = parser.parse_args()
+        run = pflrun.PFLRunFileName(params)
 
-try:
-    # create parameter object
-    params = pflparams.PFLParams(args)
+        run.Run(False)
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
 
-    print(
-        "Search for files matching '{0}' in directory '{1}'...".format(
-            args.pattern, params.ScanPath
-        )
-    )
 
-    run = PFLRunFileName(params)
-
-    run.Run(False)
-except (ValueError) as e:
-    print(f"Invalid parameter: {e.args[0]}")
-except (FileNotFoundError) as e:
-    print(f"Directory not found: {e.args[0]}")
-except (NotADirectoryError) as e:
-    print(f"Error: {e.args[0]}")
-except (KeyboardInterrupt):
-    print("Cancelled by user!")
-except (Exception) as e:
-    print("Unhandled error:", e.args[0])
+if __name__ == "__main__":
+    main()
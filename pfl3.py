@@ -11,7 +11,7 @@ and print results including mp3 tags to stdout or save as a CSV file.
 """
 
 # standard imports
-import os
+import sys
 from datetime import datetime
 
 # 3rd party imports
@@ -19,8 +19,8 @@ from tinytag import TinyTag
 
 # local imports
 import pfllib.pflargparse as pflargparse
+import pfllib.pflcache as pflcache
 import pfllib.pflparams as pflparams
-import pfllib.pflrun as pflrun
 
 
 class PFLParamsMP3(pflparams.PFLParams):
@@ -30,9 +30,12 @@ class PFLParamsMP3(pflparams.PFLParams):
         super().__init__(args, fixpattern="*.mp3")
 
 
-class PFLRunMP3(pflrun.PFLRun):
+class PFLRunMP3(pflcache.PFLRunCached):
     """Derived class for scanning and storage of mp3 file and tag information."""
 
+    CACHENAME = "mp3"
+    TAGCOUNT = 7
+
     def __init__(self, params):
         super().__init__(params)
         self.Columns = [
@@ -50,25 +53,31 @@ class PFLRunMP3(pflrun.PFLRun):
         ]
         self._fileDateTimeFormat = "%Y-%m-%d %H:%M:%S"
 
-    def getMatchDataList(self, match):
-        """Return list with data from the match."""
-        try:
-            tag = TinyTag.get(match)
-            return [
-                match.parent,
-                match.name,
-                datetime.fromtimestamp(os.path.getctime(match)),
-                datetime.fromtimestamp(os.path.getmtime(match)),
-                round(tag.duration, 3),
-                round(tag.bitrate, 0),
-                "" if tag.artist is None else tag.artist.strip(),
-                "" if tag.album is None else tag.album.strip(),
-                tag.track,
-                tag.title,
-                tag.year,
-            ]
-        except (Exception):
-            return [match.parent, match.name, None, None, 0, 0, "", "", "0", "", "-1"]
+    def getStatDataList(self, match, stat):
+        """Return list with the data of the match not read from the file content."""
+        return [
+            match.parent,
+            match.name,
+            datetime.fromtimestamp(stat.st_ctime),
+            datetime.fromtimestamp(stat.st_mtime),
+        ]
+
+    def getTagData(self, match):
+        """Return list with the tag data read from the file."""
+        tag = TinyTag.get(str(match))
+        return [
+            round(tag.duration, 3),
+            round(tag.bitrate, 0),
+            "" if tag.artist is None else tag.artist.strip(),
+            "" if tag.album is None else tag.album.strip(),
+            tag.track,
+            tag.title,
+            tag.year,
+        ]
+
+    def getErrorDataList(self, match):
+        """Return list with data for a match which could not be read."""
+        return [match.parent, match.name, None, None, 0, 0, "", "", "0", "", "-1"]
 
     def formatListStrings(self, dataList):
         """Return all elements in the list formatted as strings."""
@@ -107,31 +116,42 @@ class PFLRunMP3(pflrun.PFLRun):
         ]
 
 
-# define and collect commandline arguments
-# (kept outside try-catch block to leave exception messages untouched)
-parser = pflargparse.PFLArgParseFixedPattern(
-    description="List mp3 files in a directory and its sub-directories\n"
-    + "and print results including mp3 tags to stdout,\n"
-    + "or save as a CSV or database file."
-)
-args = parser.parse_args()
-
-try:
-    # create parameter object
-    params = PFLParamsMP3(args)
-
-    print("Search for mp3 files in directory '{}'...".format(params.ScanPath))
-
-    run = PFLRunMP3(params)
-
-    run.Run()
-except (ValueError) as e:
-    print(f"Invalid parameter: {e.args[0]}")
-except (FileNotFoundError) as e:
-    print(f"Directory not found: {e.args[0]}")
-except (NotADirectoryError) as e:
-    print(f"Error: {e.args[0]}")
-except (KeyboardInterrupt):
-    print("Cancelled by user!")
-except (Exception) as e:
-    print("Unhandled error:", e.args[0])
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = pflargparse.PFLArgParseFixedPattern(
+        description="List mp3 files in a directory and its sub-directories\n"
+        + "and print results including mp3 tags to stdout,\n"
+        + "or save as a CSV or database file."
+    )
+    # parsing the file data is CPU bound, so processes are used by default
+    parser.addWorkerArguments(defaultPool="process")
+    parser.addCacheArguments()
+    args = parser.parse_args()
+
+    try:
+        # create parameter object
+        params = PFLParamsMP3(args)
+
+        print(
+            "Search for mp3 files in directory '{}'...".format(params.ScanPath),
+            file=params.StatusOut,
+        )
+
+        run = PFLRunMP3(params)
+
+        run.Run()
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""List duplicate files matching a pattern in a directory and its sub-directories,
+and print results to stdout, save as a CSV file or write to a sqlite3 database
+(table 'duplicates'). Files are compared in stages: by size, by a hash of
+their first few KiB, and only then by a hash of the whole file.
+"""
+
+# standard imports
+import collections
+import functools
+import sys
+from datetime import datetime
+
+# local imports
+import pfllib.pflargparse as pflargparse
+import pfllib.pflhash as pflhash
+import pfllib.pflparams as pflparams
+import pfllib.pflrun as pflrun
+
+
+def hashFile(filename, algorithm, limit, blockSize, useMmap):
+    """Return the hash of the file (or of its first limit bytes),
+    or None if the file could not be read.
+    """
+    try:
+        return pflhash.hashfile(
+            pflhash.newhashes([algorithm]), filename, blockSize, limit, useMmap
+        )[0].digest()
+    except OSError:
+        return None
+
+
+class PFLArgParseDuplicates(pflargparse.PFLArgParseWUserPattern):
+    """Argument parser class adding options for comparing files by hashes."""
+
+    def __init__(self, description):
+        super().__init__(description)
+        self.add_argument(
+            "-a",
+            "--algorithm",
+            dest="algorithm",
+            type=str,
+            default="sha256",
+            help="hash algorithm used to compare files ("
+            + ", ".join(pflhash.HASHALGORITHMS)
+            + ") [default=sha256]",
+        )
+        self.add_argument(
+            "-p",
+            "--partial",
+            dest="partial",
+            type=int,
+            default=4,
+            help="size of the first part of the files hashed before hashing the"
+            + " whole files in KiB [default=4]",
+        )
+        self.add_argument(
+            "-b",
+            "--blocksize",
+            dest="blocksize",
+            type=int,
+            default=1024,
+            help="size of the blocks read for hashing in KiB [default=1024]",
+        )
+        self.add_argument(
+            "-m",
+            "--mmap",
+            dest="mmap",
+            action="store_true",
+            default=False,
+            help="memory map the files for hashing instead of reading them",
+        )
+        self.addWorkerArguments()
+
+
+class PFLParamsDuplicates(pflparams.PFLParams):
+    """Parameter class with additional options for comparing files by hashes."""
+
+    def __init__(self, args):
+        super().__init__(args)
+        self._Algorithm = args.algorithm.strip().lower()
+        if self._Algorithm not in pflhash.HASHALGORITHMS:
+            raise ValueError(
+                f"Unknown hash algorithm '{self._Algorithm}'"
+                + " (xxhash algorithms require the xxhash library)!"
+            )
+        if args.partial < 1:
+            raise ValueError("Partial hash size must be at least 1 KiB!")
+        self._PartialSize = args.partial * 1024
+        if args.blocksize < 1:
+            raise ValueError("Block size must be at least 1 KiB!")
+        self._BlockSize = args.blocksize * 1024
+        self._UseMmap = args.mmap
+
+    def getAlgorithm(self, doc="Return the name of the hash algorithm"):
+        return self._Algorithm
+
+    Algorithm = property(getAlgorithm)
+
+    def getPartialSize(self, doc="Return the size of the partial hash in bytes"):
+        return self._PartialSize
+
+    PartialSize = property(getPartialSize)
+
+    def getBlockSize(self, doc="Return the size of the blocks read for hashing"):
+        return self._BlockSize
+
+    BlockSize = property(getBlockSize)
+
+    def getUseMmap(self, doc="Return true if files are memory mapped for hashing"):
+        return self._UseMmap
+
+    UseMmap = property(getUseMmap)
+
+
+class PFLRunDuplicates(pflrun.PFLRun):
+    """Derived class collecting all matching files during the scan and storing the
+    duplicate files found after the scan, one group number per set of equal files.
+    """
+
+    OUTTABLE = "duplicates"
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.Columns = ["path", "filename", "size", "wtime", "hash", "dupgroup"]
+        self._fileDateTimeFormat = "%Y-%m-%d %H:%M:%S"
+        self._sizeGroups = collections.defaultdict(list)
+        self._countCompared = 0
+        self._countHashed = [0, 0]
+
+    def prepareScan(self, skipHidden):
+        super().prepareScan(skipHidden)
+        # all files have to be compared, unchanged folders cannot be skipped
+        self._trackDirs = False
+
+    def handleMatch(self, match, stat):
+        """Collect the (non-empty) file by its size."""
+        if stat is not None and stat.st_size > 0:
+            self._sizeGroups[stat.st_size].append((match, stat, None))
+
+    def finishMatches(self):
+        """Find the duplicates among the collected files and write them."""
+        groups = [group for group in self._sizeGroups.values() if len(group) > 1]
+        self._sizeGroups.clear()
+
+        # hash the first part of bigger files only, then the whole remaining ones
+        partialSize = self._params.PartialSize
+        duplicates = self.splitGroups(
+            [group for group in groups if group[0][1].st_size <= partialSize], None
+        ) + self.splitGroups(
+            self.splitGroups(
+                [group for group in groups if group[0][1].st_size > partialSize],
+                partialSize,
+            ),
+            None,
+        )
+
+        self._countCompared = sum(len(group) for group in groups)
+
+        duplicates.sort(key=lambda group: (-group[0][1].st_size, group[0][2]))
+        for groupNo, group in enumerate(duplicates, 1):
+            for match, stat, hashbytes in sorted(group, key=lambda file: file[0].path):
+                self.writeMatchData(
+                    [
+                        match.parent,
+                        match.name,
+                        stat.st_size,
+                        datetime.fromtimestamp(stat.st_mtime),
+                        hashbytes,
+                        groupNo,
+                    ]
+                )
+
+        super().finishMatches()
+
+    def splitGroups(self, groups, limit):
+        """Hash the files of each group (only the first limit bytes if given),
+        and return the sub-groups of files with equal hashes.
+        """
+        hashes = self.hashFiles(
+            [match for group in groups for match, _, _ in group], limit
+        )
+        self._countHashed[0 if limit is not None else 1] += len(hashes)
+
+        subGroups = []
+        index = 0
+        for group in groups:
+            byHash = collections.defaultdict(list)
+            for match, stat, _ in group:
+                if hashes[index] is not None:
+                    byHash[hashes[index]].append((match, stat, hashes[index]))
+                index += 1
+            subGroups.extend(
+                subGroup for subGroup in byHash.values() if len(subGroup) > 1
+            )
+        return subGroups
+
+    def hashFiles(self, matches, limit):
+        """Return the list of hashes of the files, computed by the workers
+        if available.
+        """
+        hashMatch = functools.partial(
+            hashFile,
+            algorithm=self._params.Algorithm,
+            limit=limit,
+            blockSize=self._params.BlockSize,
+            useMmap=self._params.UseMmap,
+        )
+        if self._pool is None:
+            return list(map(hashMatch, matches))
+        return list(self._pool.map(hashMatch, matches, chunksize=16))
+
+    def closepflout(self, duration):
+        print(
+            "Compared {0} file(s) of equal size, {1} hashed partially,".format(
+                self._countCompared, self._countHashed[0]
+            )
+            + " {0} fully.".format(self._countHashed[1])
+        )
+        super().closepflout(duration)
+
+    def getStatsInfo(self):
+        return {"hashalgorithms": self._params.Algorithm}
+
+    def formatListStrings(self, dataList):
+        """Return all elements in the list formatted as strings."""
+        return [
+            str(dataList[0]),
+            str(dataList[1]),
+            str(dataList[2]),
+            dataList[3].strftime(self._fileDateTimeFormat),
+            dataList[4].hex(),
+            str(dataList[5]),
+        ]
+
+    def formatListDatabase(self, dataList):
+        """Return all elements in the list converted to types suitable for database."""
+        return [str(dataList[0]), str(dataList[1])] + dataList[2:]
+
+
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = PFLArgParseDuplicates(
+        description="List duplicate files matching a pattern in a directory and its\n"
+        + "sub-directories, and print the results to stdout, or save as a CSV\n"
+        + "or database file."
+    )
+    args = parser.parse_args()
+
+    try:
+        # create parameter object
+        params = PFLParamsDuplicates(args)
+
+        print(
+            "Search for duplicate files matching '{0}' in directory '{1}'...".format(
+                args.pattern, params.ScanPath
+            ),
+            file=params.StatusOut,
+        )
+
+        run = PFLRunDuplicates(params)
+
+        run.Run(False)
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
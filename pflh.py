@@ -12,19 +12,21 @@ to stdout or save as a CSV file.
 """
 
 # standard imports
-import hashlib
+import concurrent.futures
 import os
+import sys
 from datetime import datetime
 
 # local imports
 import pfllib.pflargparse as pflargparse
+import pfllib.pflhash as pflhash
 import pfllib.pflparams as pflparams
 import pfllib.pflrun as pflrun
 
 
 class PFLArgParseWUserPatternAndLimit(pflargparse.PFLArgParseWUserPattern):
     """Argument parser class adding an option to limit scanned file size
-    used for hashing.
+    used for hashing, options for unchanged files and hashing workers.
     """
 
     def __init__(self, description):
@@ -37,6 +39,65 @@ class PFLArgParseWUserPatternAndLimit(pflargparse.PFLArgParseWUserPattern):
             default=False,
             help="limit the scanned file size for hash value calculation to 100MB",
         )
+        self.add_argument(
+            "-a",
+            "--algorithms",
+            dest="algorithms",
+            type=str,
+            default="sha256",
+            help="comma separated list of hash algorithms computed in the same pass,"
+            + " one column each (" + ", ".join(pflhash.HASHALGORITHMS) + ")"
+            + " [default=sha256]",
+        )
+        self.add_argument(
+            "-s",
+            "--skip-unchanged",
+            dest="skipunchanged",
+            action="store_true",
+            default=False,
+            help="on update of a SQLite database, reuse the stored hash of files"
+            + " with unchanged size and modification time",
+        )
+        self.add_argument(
+            "--verify-every",
+            dest="verifyevery",
+            type=int,
+            default=0,
+            help="with --skip-unchanged, hash every n-th unchanged file anyway"
+            + " and report differing hashes [default=0 (never)]",
+        )
+        self.add_argument(
+            "-b",
+            "--blocksize",
+            dest="blocksize",
+            type=int,
+            default=1024,
+            help="size of the blocks read for hashing in KiB [default=1024]",
+        )
+        self.add_argument(
+            "-m",
+            "--mmap",
+            dest="mmap",
+            action="store_true",
+            default=False,
+            help="memory map the files for hashing instead of reading them",
+        )
+        self.add_argument(
+            "--inodes",
+            dest="inodes",
+            action="store_true",
+            default=False,
+            help="add columns with the inode number and the number of hardlinks"
+            + " of each file",
+        )
+        self.add_argument(
+            "--hardlinks",
+            dest="hardlinks",
+            action="store_true",
+            default=False,
+            help="hash files with several hardlinks only once per run",
+        )
+        self.addWorkerArguments()
 
 
 # def check_positive(value):
@@ -52,6 +113,26 @@ class PFLParamsWithLimit(pflparams.PFLParams):
     def __init__(self, args):
         super().__init__(args)
         self._IsLimited = args.limit
+        self._SkipUnchanged = args.skipunchanged
+        self._VerifyEvery = args.verifyevery
+        if self._VerifyEvery < 0:
+            raise ValueError("Number of files to verify must not be negative!")
+        if args.blocksize < 1:
+            raise ValueError("Block size must be at least 1 KiB!")
+        self._BlockSize = args.blocksize * 1024
+        self._UseMmap = args.mmap
+        self._RecordInodes = args.inodes
+        self._HashLinksOnce = args.hardlinks
+
+        self._Algorithms = list(
+            dict.fromkeys(a.strip().lower() for a in args.algorithms.split(","))
+        )
+        for algorithm in self._Algorithms:
+            if algorithm not in pflhash.HASHALGORITHMS:
+                raise ValueError(
+                    f"Unknown hash algorithm '{algorithm}'"
+                    + " (xxhash algorithms require the xxhash library)!"
+                )
 
     def getIsLimited(
         self, doc="Return true if the file size for hashing will be limited"
@@ -60,59 +141,264 @@ class PFLParamsWithLimit(pflparams.PFLParams):
 
     IsLimited = property(getIsLimited)
 
+    def getSkipUnchanged(
+        self, doc="Return true if stored hashes of unchanged files are reused"
+    ):
+        return self._SkipUnchanged
+
+    SkipUnchanged = property(getSkipUnchanged)
+
+    def getVerifyEvery(
+        self, doc="Return the number of unchanged files to hash one of anyway"
+    ):
+        return self._VerifyEvery
+
+    VerifyEvery = property(getVerifyEvery)
+
+    def getBlockSize(self, doc="Return the size of the blocks read for hashing"):
+        return self._BlockSize
+
+    BlockSize = property(getBlockSize)
+
+    def getUseMmap(self, doc="Return true if files are memory mapped for hashing"):
+        return self._UseMmap
+
+    UseMmap = property(getUseMmap)
+
+    def getAlgorithms(self, doc="Return the list of hash algorithm names"):
+        return self._Algorithms
+
+    Algorithms = property(getAlgorithms)
+
+    def getRecordInodes(
+        self, doc="Return true if inode number and number of hardlinks are listed"
+    ):
+        return self._RecordInodes
+
+    RecordInodes = property(getRecordInodes)
+
+    def getHashLinksOnce(
+        self, doc="Return true if files with several hardlinks are hashed only once"
+    ):
+        return self._HashLinksOnce
+
+    HashLinksOnce = property(getHashLinksOnce)
+
 
 class PFLRunFileInfoWithSHA256(pflrun.PFLRun):
-    """Derived class for scanning and storage of file information including SHA256 hash."""
+    """Derived class for scanning and storage of file information including SHA256
+    hash (or the hashes of other selected algorithms, one column each).
+    """
 
     BIGFILESIZELIMIT = 100 * 1024 * 1024
 
     def __init__(self, params):
         super().__init__(params)
-        self.Columns = ["path", "filename", "size", "ctime", "wtime", "hash"]
+        self._hashColumns = [
+            "hash" if algorithm == "sha256" else f"hash_{algorithm}"
+            for algorithm in params.Algorithms
+        ]
+        self._hashSlice = slice(5, 5 + len(self._hashColumns))
+        self.Columns = [
+            "path",
+            "filename",
+            "size",
+            "ctime",
+            "wtime",
+        ] + self._hashColumns
+        if params.RecordInodes:
+            self.Columns += ["inode", "links"]
         self._fileDateTimeFormat = "%Y-%m-%d %H:%M:%S"
+        self._countUnchanged = 0
+        self._countVerified = 0
+        self._countMismatches = 0
+        self._countLinked = 0
+        self._verifyHashes = {}
+        # (device, inode): hashes, or the future of the match data in work
+        self._inodeHashes = {}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_inodeHashes", None)
+        return state
 
-    def getMatchDataList(self, match):
-        """Return list with data from the match."""
+    def handleMatch(self, match, stat):
+        """Keep the stored hashes of an unchanged file, or reuse the hashes of
+        another hardlink to the same file, otherwise hash the file (by a worker
+        if available).
+        """
+        inodeKey = None
+        if self._params.RecordInodes or self._params.HashLinksOnce:
+            stat = self.getInodeStat(match, stat)
+            if self._params.HashLinksOnce:
+                inodeKey = self.getInodeKey(stat)
+        hashes = self.getStoredHashes(match, stat)
+        if hashes is None and inodeKey in self._inodeHashes:
+            self._countLinked += 1
+            linked = self._inodeHashes[inodeKey]
+            if isinstance(linked, concurrent.futures.Future):
+                self.addPendingMatch(self.getLinkedFuture(linked, match, stat))
+                return
+            hashes = linked
+
+        if hashes is not None:
+            self.addMatchData(self.getMatchDataList(match, stat, hashes))
+        elif self._pool is None:
+            matchDataList = self.getMatchDataList(match, stat)
+            if inodeKey is not None:
+                self._inodeHashes[inodeKey] = matchDataList[self._hashSlice]
+            self.writeMatchData(matchDataList)
+        else:
+            future = self._pool.submit(self._getPoolMatchDataList, match, stat)
+            if inodeKey is not None:
+                self._inodeHashes[inodeKey] = future
+            self.addPendingMatch(future)
+
+    def getInodeStat(self, match, stat):
+        """Return the stat of the file including inode data, read again if the
+        stat of the directory entry has none (on Windows).
+        """
+        if stat is None or stat.st_ino != 0:
+            return stat
         try:
-            stat = os.stat(match)
-            if stat.st_size > 0:
-                if params.IsLimited and stat.st_size > self.BIGFILESIZELIMIT:
-                    hashbytes = self.getHashBytesLimited(match)
+            return os.stat(match)
+        except OSError:
+            return stat
+
+    def getInodeKey(self, stat):
+        """Return the tuple (device, inode) of a non-empty file with several
+        hardlinks, otherwise None (also if the platform reports no inodes).
+        """
+        if stat is None or stat.st_nlink < 2 or stat.st_ino == 0 or stat.st_size == 0:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def getLinkedFuture(self, linked, match, stat):
+        """Return a future of the match data of the file, set as soon as the
+        hashes of the linked file in work are done.
+        """
+        future = concurrent.futures.Future()
+
+        def setLinkedResult(done):
+            # pass an error or cancellation of the linked file on, so the
+            # waiting for the future does not hang
+            if done.cancelled():
+                future.cancel()
+                return
+            try:
+                hashes = done.result()[self._hashSlice]
+                future.set_result(self.getMatchDataList(match, stat, hashes))
+            except Exception as e:
+                future.set_exception(e)
+
+        linked.add_done_callback(setLinkedResult)
+        return future
+
+    def getMatchDataList(self, match, stat, hashes=None):
+        """Return list with data from the match, hash the file if no hashes given."""
+        try:
+            if hashes is None:
+                if stat.st_size > 0:
+                    hashes = self.getFileHashes(match, stat)
                 else:
-                    hashbytes = self.getHashBytes(match)
-            else:
-                hashbytes = None
+                    hashes = len(self._hashColumns) * [None]
 
-            return [
+            matchDataList = [
                 match.parent,
                 match.name,
                 stat.st_size,
                 datetime.fromtimestamp(stat.st_ctime),
                 datetime.fromtimestamp(stat.st_mtime),
-                hashbytes,
-            ]
+            ] + hashes
+            if self._params.RecordInodes:
+                matchDataList += [stat.st_ino, stat.st_nlink]
+            return matchDataList
         except Exception:
-            return [match.parent, match.name, -1, None, None, None]
-
-    def getHashBytesLimited(self, filename):
-        """Return the SHA256 hash of the file scanning only the first 100MB."""
-        hashsha = hashlib.sha256()  # create a new object for each file!
-        with open(filename, "rb") as f:
-            bytesRead = 0
-            for block in iter(lambda: f.read(8192), b""):
-                hashsha.update(block)
-                bytesRead += len(block)
-                if bytesRead >= self.BIGFILESIZELIMIT:
-                    break
-        return hashsha.digest()
-
-    def getHashBytes(self, filename):
-        """Return the SHA256 hash of the file."""
-        hashsha = hashlib.sha256()  # create a new object for each file!
-        with open(filename, "rb") as f:
-            for block in iter(lambda: f.read(8192), b""):
-                hashsha.update(block)
-        return hashsha.digest()
+            return [match.parent, match.name, -1, None, None] + (
+                len(self.Columns) - 5
+            ) * [None]
+
+    def getStoredHashes(self, match, stat):
+        """Return the list of hashes stored in the output for the file, if its size
+        and modification time are unchanged, otherwise return None. Every n-th
+        unchanged file is hashed again for verification.
+        """
+        if not self._params.SkipUnchanged or stat is None or stat.st_size == 0:
+            return None
+
+        stored = self._pflout.getStoredRow(match.parent, match.name)
+        if (
+            stored is None
+            or stored["size"] != stat.st_size
+            or stored["wtime"] != str(datetime.fromtimestamp(stat.st_mtime))
+        ):
+            return None
+
+        hashes = [stored.get(column) for column in self._hashColumns]
+        if None in hashes:
+            return None
+
+        countUnchanged = self._countUnchanged + self._countVerified + 1
+        if (
+            self._params.VerifyEvery > 0
+            and countUnchanged % self._params.VerifyEvery == 0
+        ):
+            # compare when the new hash is written
+            self._countVerified += 1
+            self._verifyHashes[(match.parent, match.name)] = hashes
+            return None
+
+        self._countUnchanged += 1
+        return hashes
+
+    def writeMatchData(self, matchDataList):
+        if self._verifyHashes:
+            storedHashes = self._verifyHashes.pop(
+                (matchDataList[0], matchDataList[1]), None
+            )
+            if (
+                storedHashes is not None
+                and storedHashes != matchDataList[self._hashSlice]
+            ):
+                self._countMismatches += 1
+                print(
+                    "\nChanged hash of unchanged file '{0}'!".format(
+                        matchDataList[0] / matchDataList[1]
+                    )
+                )
+        super().writeMatchData(matchDataList)
+
+    def getFileHashes(self, match, stat):
+        """Return the list of hashes of the file computed in one read pass,
+        limited to the first 100MB if requested.
+        """
+        limit = None
+        if self._params.IsLimited and stat.st_size > self.BIGFILESIZELIMIT:
+            limit = self.BIGFILESIZELIMIT
+        # create new hash objects for each file!
+        hashObjects = pflhash.hashfile(
+            pflhash.newhashes(self._params.Algorithms),
+            match,
+            self._params.BlockSize,
+            limit,
+            self._params.UseMmap,
+        )
+        return [hashObject.digest() for hashObject in hashObjects]
+
+    def getStatsInfo(self):
+        return {"hashalgorithms": ",".join(self._params.Algorithms)}
+
+    def closepflout(self, duration):
+        if self._params.SkipUnchanged:
+            print(
+                "Verified {0} unchanged file(s), {1} hash(es) changed,".format(
+                    self._countVerified, self._countMismatches
+                )
+                + " kept hash of {0} unchanged file(s).".format(self._countUnchanged)
+            )
+        if self._countLinked > 0:
+            print(f"Reused hash of {self._countLinked} hardlinked file(s).")
+        super().closepflout(duration)
 
     def formatListStrings(self, dataList):
         """Return all elements in the list formatted as strings."""
@@ -126,50 +412,55 @@ class PFLRunFileInfoWithSHA256(pflrun.PFLRun):
             dataList[4].strftime(self._fileDateTimeFormat)
             if dataList[4] is not None
             else "",
-            dataList[5].hex() if dataList[5] is not None else "",
+        ] + [
+            hashbytes.hex() if hashbytes is not None else ""
+            for hashbytes in dataList[self._hashSlice]
+        ] + [
+            str(value) if value is not None else ""
+            for value in dataList[self._hashSlice.stop :]
         ]
 
     def formatListDatabase(self, dataList):
         """Return all elements in the list converted to types suitable for database."""
-        return [
-            str(dataList[0]),
-            str(dataList[1]),
-            dataList[2],
-            dataList[3],
-            dataList[4],
-            dataList[5],
-        ]
+        return [str(dataList[0]), str(dataList[1])] + dataList[2:]
 
 
-# define and collect commandline arguments
-# (kept outside try-catch block to leave exception messages untouched)
-parser = PFLArgParseWUserPatternAndLimit(
-    description="List files matching a pattern in a directory and its sub-directories,\n"
-    + "and print results including file information with SHA256 to stdout,\n"
-    + "or save as a CSV or database file."
-)
-args = parser.parse_args()
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = PFLArgParseWUserPatternAndLimit(
+        description="List files matching a pattern in a directory and its"
+        + " sub-directories,\n"
+        + "and print results including file information with SHA256 to stdout,\n"
+        + "or save as a CSV or database file."
+    )
+    args = parser.parse_args()
 
-try:
-    # create parameter object
-    params = PFLParamsWithLimit(args)
+    try:
+        # create parameter object
+        params = PFLParamsWithLimit(args)
 
-    print(
-        "Search for files matching '{0}' in directory '{1}'...".format(
-            args.pattern, params.ScanPath
+        print(
+            "Search for files matching '{0}' in directory '{1}'...".format(
+                args.pattern, params.ScanPath
+            ),
+            file=params.StatusOut,
         )
-    )
 
-    run = PFLRunFileInfoWithSHA256(params)
-
-    run.Run(False)
-except (ValueError) as e:
-    print(f"Invalid parameter: {e.args[0]}")
-except (FileNotFoundError) as e:
-    print(f"Directory not found: {e.args[0]}")
-except (NotADirectoryError) as e:
-    print(f"Error: {e.args[0]}")
-except (KeyboardInterrupt):
-    print("Cancelled by user!")
-except (Exception) as e:
-    print("Unhandled error:", e.args[0])
+        run = PFLRunFileInfoWithSHA256(params)
+
+        run.Run(False)
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
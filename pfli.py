@@ -11,7 +11,7 @@ and print results including file information to stdout or save as a CSV file
 """
 
 # standard imports
-import os
+import sys
 from datetime import datetime
 
 # local imports
@@ -28,15 +28,15 @@ class PFLRunFileInfo(pflrun.PFLRun):
         self.Columns = ["path", "filename", "size", "ctime", "wtime"]
         self._fileDateTimeFormat = "%Y-%m-%d %H:%M:%S"
 
-    def getMatchDataList(self, match):
+    def getMatchDataList(self, match, stat):
         """Return list with data from the match."""
         try:
             return [
                 match.parent,
                 match.name,
-                os.path.getsize(match),
-                datetime.fromtimestamp(os.path.getctime(match)),
-                datetime.fromtimestamp(os.path.getmtime(match)),
+                stat.st_size,
+                datetime.fromtimestamp(stat.st_ctime),
+                datetime.fromtimestamp(stat.st_mtime),
             ]
         except Exception:
             return [match.parent, match.name, -1, None, None]
@@ -66,35 +66,42 @@ class PFLRunFileInfo(pflrun.PFLRun):
         ]
 
 
-# define and collect commandline arguments
-# (kept outside try-catch block to leave exception messages untouched)
-parser = pflargparse.PFLArgParseWUserPattern(
-    description="List files matching a pattern in a directory and its sub-directories,\n"
-    + "and print results including file information to stdout,\n"
-    + "or save as a CSV or database file."
-)
-args = parser.parse_args()
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = pflargparse.PFLArgParseWUserPattern(
+        description="List files matching a pattern in a directory and its"
+        + " sub-directories,\n"
+        + "and print results including file information to stdout,\n"
+        + "or save as a CSV or database file."
+    )
+    args = parser.parse_args()
 
-try:
-    # create parameter object
-    params = pflparams.PFLParams(args)
+    try:
+        # create parameter object
+        params = pflparams.PFLParams(args)
 
-    print(
-        "Search for files matching '{0}' in directory '{1}'...".format(
-            args.pattern, params.ScanPath
+        print(
+            "Search for files matching '{0}' in directory '{1}'...".format(
+                args.pattern, params.ScanPath
+            ),
+            file=params.StatusOut,
         )
-    )
 
-    run = PFLRunFileInfo(params)
-
-    run.Run(False)
-except (ValueError) as e:
-    print(f"Invalid parameter: {e.args[0]}")
-except (FileNotFoundError) as e:
-    print(f"Directory not found: {e.args[0]}")
-except (NotADirectoryError) as e:
-    print(f"Error: {e.args[0]}")
-except (KeyboardInterrupt):
-    print("Cancelled by user!")
-except (Exception) as e:
-    print("Unhandled error:", e.args[0])
+        run = PFLRunFileInfo(params)
+
+        run.Run(False)
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,14 @@ and print results including jpg tags to stdout or save as a CSV file
 """
 
 # standard imports
-import os
+import sys
 from datetime import datetime
 
-# 3rd party imports
-from PIL import Image
-
 # local imports
 import pfllib.pflargparse as pflargparse
+import pfllib.pflcache as pflcache
+import pfllib.pfljpeg as pfljpeg
 import pfllib.pflparams as pflparams
-import pfllib.pflrun as pflrun
 
 # from exif import Image as imgEXIF
 
@@ -32,9 +30,12 @@ class PFLParamsJPG(pflparams.PFLParams):
         super().__init__(args, fixpattern="*.jpg")
 
 
-class PFLRunJPG(pflrun.PFLRun):
+class PFLRunJPG(pflcache.PFLRunCached):
     """Derived class for scanning and storage of jpg file and image information."""
 
+    CACHENAME = "jpg"
+    TAGCOUNT = 2
+
     def __init__(self, params):
         super().__init__(params)
         self.Columns = [
@@ -48,22 +49,34 @@ class PFLRunJPG(pflrun.PFLRun):
         ]
         self._fileDateTimeFormat = "%Y-%m-%d %H:%M:%S"
 
-    def getMatchDataList(self, match):
-        """Return list with data from the match."""
-        try:
-            im = Image.open(match)
-            width, height = im.size
-            return [
-                match.parent,
-                match.name,
-                datetime.fromtimestamp(os.path.getctime(match)),
-                datetime.fromtimestamp(os.path.getmtime(match)),
-                os.path.getsize(match),
-                width,
-                height,
-            ]
-        except (Exception):
-            return [match.parent, match.name, None, None, -1, -1, -1]
+    def getStatDataList(self, match, stat):
+        """Return list with the data of the match not read from the file content."""
+        return [
+            match.parent,
+            match.name,
+            datetime.fromtimestamp(stat.st_ctime),
+            datetime.fromtimestamp(stat.st_mtime),
+            stat.st_size,
+        ]
+
+    def getTagData(self, match):
+        """Return list with width and height of the image."""
+        size = pfljpeg.jpegsize(match)
+        return list(size if size is not None else self.getImageSize(match))
+
+    def getErrorDataList(self, match):
+        """Return list with data for a match which could not be read."""
+        return [match.parent, match.name, None, None, -1, -1, -1]
+
+    def getImageSize(self, match):
+        """Return the tuple (width, height) read with Pillow, used for files
+        with a header the built-in reader does not understand.
+        """
+        # 3rd party imports (only when needed)
+        from PIL import Image
+
+        with Image.open(str(match)) as im:
+            return im.size
 
     def formatListStrings(self, dataList):
         """Return all elements in the list formatted as strings."""
@@ -94,31 +107,42 @@ class PFLRunJPG(pflrun.PFLRun):
         ]
 
 
-# define and collect commandline arguments
-# (kept outside try-catch block to leave exception messages untouched)
-parser = pflargparse.PFLArgParseFixedPattern(
-    description="List jpg files in a directory and its sub-directories\n"
-    + "and print results including jpg tags to stdout,\n"
-    + "or save as a CSV or database file."
-)
-args = parser.parse_args()
-
-try:
-    # create parameter object
-    params = PFLParamsJPG(args)
-
-    print("Search for jpg files in directory '{}'...".format(params.ScanPath))
-
-    run = PFLRunJPG(params)
-
-    run.Run()
-except (ValueError) as e:
-    print(f"Invalid parameter: {e.args[0]}")
-except (FileNotFoundError) as e:
-    print(f"Directory not found: {e.args[0]}")
-except (NotADirectoryError) as e:
-    print(f"Error: {e.args[0]}")
-except (KeyboardInterrupt):
-    print("Cancelled by user!")
-except (Exception) as e:
-    print("Unhandled error:", e.args[0])
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = pflargparse.PFLArgParseFixedPattern(
+        description="List jpg files in a directory and its sub-directories\n"
+        + "and print results including jpg tags to stdout,\n"
+        + "or save as a CSV or database file."
+    )
+    # parsing the file data is CPU bound, so processes are used by default
+    parser.addWorkerArguments(defaultPool="process")
+    parser.addCacheArguments()
+    args = parser.parse_args()
+
+    try:
+        # create parameter object
+        params = PFLParamsJPG(args)
+
+        print(
+            "Search for jpg files in directory '{}'...".format(params.ScanPath),
+            file=params.StatusOut,
+        )
+
+        run = PFLRunJPG(params)
+
+        run.Run()
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,4 +8,8 @@ __date__ = "07/09/2023"
 
 """Package pfllib for MiH's PyFList:
 imports modules with classes PFLParams, PFLOut and PFLRun...
+and provides function scan to stream the records of matching files.
 """
+
+# local imports
+from pfllib.pflapi import scan  # noqa: F401
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Module with the library interface of pfllib: function scan streams the
+records of the matching files, without printing or writing any output.
+"""
+
+# standard imports
+import collections
+
+# local imports
+import pfllib.pflrun as pflrun
+
+
+def scan(params, runClass=pflrun.PFLRunFileName, skipHidden=True):
+    """Yield a record for each file matching the parameters, a named tuple with
+    the columns of the run class as fields (path and filename by default),
+    holding the data unformatted (e.g. path as pathlib.Path, times as datetime).
+    The scan runs lazily in the iterating thread, closing the generator early
+    stops it. If skipHidden is true, files and folders starting with a dot are
+    ignored (as by glob).
+    """
+    run = runClass(params)
+    Record = collections.namedtuple("PFLRecord", run.Columns)
+    for dataList in run.iterMatches(skipHidden):
+        yield Record._make(dataList)
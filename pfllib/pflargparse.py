@@ -8,7 +8,8 @@ __date__ = "07/15/2023"
 
 """Classes in PFLArgParse derive from ArgumentParser and define different argument
 parsers with a set of default arguments for file listings
-(fixed pattern or user defined pattern).
+(fixed pattern or user defined pattern). Arguments may be read from files
+given as @file, one argument per line.
 """
 
 # standard imports
@@ -22,7 +23,7 @@ class PFLArgParseOptionalPattern(ArgumentParser):
     """
 
     def __init__(self, description, withPattern):
-        super().__init__(description)
+        super().__init__(description, fromfile_prefix_chars="@")
         self.add_argument(
             "-r",
             "--recurse",
@@ -41,6 +42,33 @@ class PFLArgParseOptionalPattern(ArgumentParser):
             help="exclude files and/or folders matching this regular expression",
         )
 
+        self.add_argument(
+            "-j",
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="number of threads scanning folders in parallel [default=1]",
+        )
+
+        self.add_argument(
+            "--async",
+            dest="asyncpipeline",
+            action="store_true",
+            default=False,
+            help="run scan, data extraction, formatting and output as concurrent"
+            + " pipeline stages",
+        )
+
+        self.add_argument(
+            "--format",
+            dest="format",
+            choices=["csv", "sqlite", "jsonl", "parquet"],
+            default=None,
+            help="output format [default=by outfile suffix: .csv, .jsonl,"
+            + " .parquet or else SQLite, text on stdout]",
+        )
+
         if withPattern:
             self.addPatternArgument()
 
@@ -85,6 +113,33 @@ class PFLArgParseOptionalPattern(ArgumentParser):
             help="update SQLite database or append to the CSV outfile if existent",
         )
 
+        fileopt_group.add_argument(
+            "-i",
+            "--incremental",
+            dest="incremental",
+            action="store_true",
+            default=False,
+            help="on update of a SQLite database, skip folders unchanged since the"
+            + " last run (same modification time and number of entries)",
+        )
+
+        fileopt_group.add_argument(
+            "--flush-rows",
+            dest="flushrows",
+            type=int,
+            default=1000,
+            help="write the buffered rows of a CSV or JSON lines file after this"
+            + " number of rows [default=1000]",
+        )
+        fileopt_group.add_argument(
+            "--flush-interval",
+            dest="flushinterval",
+            type=float,
+            default=1.0,
+            help="write the buffered rows of a CSV or JSON lines file after this"
+            + " number of seconds [default=1.0]",
+        )
+
         dotmode_group = fileopt_group.add_mutually_exclusive_group()
 
         dotmode_group.add_argument(
@@ -105,6 +160,96 @@ class PFLArgParseOptionalPattern(ArgumentParser):
             + "(i.e. 0=every file, 1=each 10 files, 2=each 100 files...)",
         )
 
+        self.addDatabaseArguments()
+
+    def addDatabaseArguments(self):
+        database_group = self.add_argument_group(
+            "database options", "optional arguments apply when writing to a database"
+        )
+        database_group.add_argument(
+            "--db-profile",
+            dest="dbprofile",
+            choices=["default", "fast"],
+            default="default",
+            help="SQLite settings: default, or fast for WAL journal,"
+            + " synchronous=NORMAL, larger caches and one transaction per run"
+            + " [default=default]",
+        )
+        database_group.add_argument(
+            "--pragma",
+            dest="pragmas",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="set a SQLite pragma in addition to the profile (repeatable)",
+        )
+        database_group.add_argument(
+            "--commit-rows",
+            dest="commitrows",
+            type=int,
+            default=None,
+            help="commit after this number of files, 0 for one transaction per run"
+            + " [default=50, 0 for the fast profile]",
+        )
+        database_group.add_argument(
+            "--writer-thread",
+            dest="writerthread",
+            action="store_true",
+            default=False,
+            help="write to the database in a dedicated thread while the scan"
+            + " continues (implied by --async)",
+        )
+
+    def addWorkerArguments(self, defaultPool="thread"):
+        worker_group = self.add_argument_group(
+            "worker options", "optional arguments for extracting file data in parallel"
+        )
+        worker_group.add_argument(
+            "-w",
+            "--workers",
+            dest="workers",
+            type=int,
+            default=0,
+            help="number of workers extracting the file data [default=0 (none)]",
+        )
+        worker_group.add_argument(
+            "--pool",
+            dest="pool",
+            choices=["thread", "process"],
+            default=defaultPool,
+            help="use a pool of threads or processes as workers"
+            + f" [default={defaultPool}]",
+        )
+        worker_group.add_argument(
+            "--ordered",
+            dest="ordered",
+            action="store_true",
+            default=False,
+            help="write results in scan order instead of as soon as available",
+        )
+
+    def addCacheArguments(self):
+        cache_group = self.add_argument_group(
+            "cache options", "optional arguments for caching the data read from files"
+        )
+        cache_group.add_argument(
+            "-c",
+            "--cache",
+            dest="cache",
+            type=pathlib.Path,
+            default=None,
+            help="SQLite file caching the data read from files, which is reused"
+            + " for files with unchanged size and modification time [default=none]",
+        )
+        cache_group.add_argument(
+            "--cache-size",
+            dest="cachesize",
+            type=int,
+            default=500000,
+            help="maximum number of files kept in the cache, the ones not seen for"
+            + " the longest time are removed first [default=500000]",
+        )
+
     def addPatternArgument(self):
         self.add_argument(
             "pattern",
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLCache keeps the data read from files (e.g. media tags) in a SQLite
+file, keyed by path, size and modification time. Class PFLRunCached uses it
+to read only new or changed files.
+"""
+
+# standard imports
+import json
+import time
+
+# local imports
+import pfllib.pflrun as pflrun
+import pfllib.pfsql as pfsql
+
+
+class PFLCache:
+    """Class PFLCache stores the data of files per tool in a SQLite database.
+    Entries of files not seen for MAXAGE seconds are removed on close, as are
+    the oldest ones exceeding the maximum number of entries.
+    """
+
+    MAXAGE = 180 * 24 * 3600
+    # number of changes written in one transaction
+    FLUSHCOUNT = 1000
+
+    def __init__(self, filePath, toolName, maxEntries):
+        self._db = pfsql.opendb(filePath)
+        self._toolName = toolName
+        self._maxEntries = maxEntries
+        self._runTime = int(time.time())
+        self._seenPaths = []
+        self._newEntries = []
+        self._countHits = 0
+        pfsql.createtable(
+            self._db,
+            "cache",
+            [
+                "tool TEXT",
+                "path TEXT",
+                "size INTEGER",
+                "mtime INTEGER",
+                "data TEXT",
+                "lastseen INTEGER",
+            ],
+            True,
+            "PRIMARY KEY(tool, path)",
+        )
+        self._db[1].execute(
+            "CREATE INDEX IF NOT EXISTS cache_lastseen ON cache(lastseen)"
+        )
+
+    def getCountHits(self, doc="Return the number of files found in the cache"):
+        return self._countHits
+
+    CountHits = property(getCountHits)
+
+    def get(self, path, size, mtimeNs):
+        """Return the cached data of the file, or None if it is not cached or its
+        size or modification time (in ns) changed.
+        """
+        row = self._db[1].execute(
+            "SELECT size, mtime, data FROM cache WHERE tool = ? AND path = ?",
+            (self._toolName, path),
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtimeNs:
+            return None
+
+        self._countHits += 1
+        self._seenPaths.append((self._runTime, self._toolName, path))
+        if len(self._seenPaths) >= self.FLUSHCOUNT:
+            self.flush()
+        return json.loads(row[2])
+
+    def put(self, path, size, mtimeNs, data):
+        """Store the data (a JSON serializable list) of the file."""
+        self._newEntries.append(
+            (self._toolName, path, size, mtimeNs, json.dumps(data), self._runTime)
+        )
+        if len(self._newEntries) >= self.FLUSHCOUNT:
+            self.flush()
+
+    def flush(self):
+        """Write the new entries and the last seen time of the cached files."""
+        if self._seenPaths:
+            self._db[1].executemany(
+                "UPDATE cache SET lastseen = ? WHERE tool = ? AND path = ?",
+                self._seenPaths,
+            )
+            self._seenPaths = []
+        if self._newEntries:
+            self._db[1].executemany(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                self._newEntries,
+            )
+            self._newEntries = []
+        self._db[0].commit()
+
+    def evict(self):
+        """Remove entries not seen for a long time and the oldest ones exceeding
+        the maximum number of entries.
+        """
+        self._db[1].execute(
+            "DELETE FROM cache WHERE lastseen < ?", (self._runTime - self.MAXAGE,)
+        )
+        count = self._db[1].execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self._maxEntries:
+            self._db[1].execute(
+                "DELETE FROM cache WHERE rowid IN"
+                + " (SELECT rowid FROM cache ORDER BY lastseen LIMIT ?)",
+                (count - self._maxEntries,),
+            )
+        self._db[0].commit()
+
+    def close(self):
+        try:
+            self.flush()
+            self.evict()
+        finally:
+            pfsql.closedb(self._db)
+
+
+class PFLRunCached(pflrun.PFLRun):
+    """Derived class taking the data read from the file content from a cache
+    if given and the file is unchanged. Derived classes define getStatDataList,
+    getTagData and getErrorDataList, the name of the data in the cache and the
+    number of (last) data list elements read from the file content.
+    """
+
+    CACHENAME = None
+    TAGCOUNT = 0
+
+    def __init__(self, params):
+        super().__init__(params)
+        self._cache = None
+        # path: (size, mtime) of the files in work, to be cached when written
+        self._cacheKeys = {}
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_cache", None)
+        state.pop("_cacheKeys", None)
+        return state
+
+    def createpflout(self):
+        super().createpflout()
+        if self._params.CacheFilePath is not None:
+            self._cache = PFLCache(
+                self._params.CacheFilePath, self.CACHENAME, self._params.CacheSize
+            )
+
+    def closepflout(self, duration):
+        try:
+            if self._cache is not None:
+                print(f"Took the data of {self._cache.CountHits} file(s) from cache.")
+                self._cache.close()
+                self._cache = None
+        finally:
+            super().closepflout(duration)
+
+    def handleMatch(self, match, stat):
+        """Take the data of an unchanged file from the cache, otherwise read the
+        file (by a worker if available) and cache its data when written.
+        """
+        if self._cache is None or stat is None:
+            super().handleMatch(match, stat)
+            return
+
+        path = str(match)
+        tagData = self._cache.get(path, stat.st_size, stat.st_mtime_ns)
+        if tagData is not None:
+            self.addMatchData(self.getMatchDataList(match, stat, tagData))
+        else:
+            self._cacheKeys[path] = (stat.st_size, stat.st_mtime_ns)
+            super().handleMatch(match, stat)
+
+    def getMatchDataList(self, match, stat, tagData=None):
+        """Return list with data from the match, read the tag data from the file
+        if not given.
+        """
+        try:
+            if tagData is None:
+                tagData = self.getTagData(match)
+            return self.getStatDataList(match, stat) + tagData
+        except (Exception):
+            return self.getErrorDataList(match)
+
+    def getStatDataList(self, match, stat):
+        """Return list with the data of the match not read from the file content."""
+        return None
+
+    def getTagData(self, match):
+        """Return list with the data read from the file content."""
+        return None
+
+    def getErrorDataList(self, match):
+        """Return list with data for a match which could not be read."""
+        return None
+
+    def writeMatchData(self, matchDataList):
+        if self._cacheKeys:
+            path = str(matchDataList[0] / matchDataList[1])
+            cacheKey = self._cacheKeys.pop(path, None)
+            # error data lists have no file dates
+            if cacheKey is not None and matchDataList[2] is not None:
+                self._cache.put(path, *cacheKey, matchDataList[-self.TAGCOUNT :])
+        super().writeMatchData(matchDataList)
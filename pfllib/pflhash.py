@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Module with file hashing helper functions. Files are read into one reused
+buffer (or memory mapped), so no new bytes object is allocated per block,
+and several hash objects can be fed from the same blocks.
+"""
+
+# standard imports
+import hashlib
+import mmap
+import os
+
+# 3rd party imports (optional)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULTBLOCKSIZE = 1024 * 1024
+
+# hash algorithm name: constructor of a new hash object
+HASHALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "sha1": hashlib.sha1,
+    "md5": hashlib.md5,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+    "sha3_256": hashlib.sha3_256,
+}
+if xxhash is not None:
+    HASHALGORITHMS.update(
+        {"xxh64": xxhash.xxh64, "xxh3_64": xxhash.xxh3_64, "xxh3_128": xxhash.xxh3_128}
+    )
+
+
+def newhashes(algorithms):
+    """Return a list with a new hash object for each algorithm name."""
+    return [HASHALGORITHMS[algorithm]() for algorithm in algorithms]
+
+
+def hashfile(
+    hashObjects, filename, blockSize=DEFAULTBLOCKSIZE, limit=None, useMmap=False
+):
+    """Update all hash objects in the list with the content of the file, or only
+    its first limit bytes, and return the list of hash objects.
+    """
+    with open(filename, "rb", buffering=0) as f:
+        if useMmap:
+            length = os.fstat(f.fileno()).st_size
+            if limit is not None:
+                length = min(length, limit)
+            if length == 0:
+                return hashObjects
+            try:
+                mapped = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # not mappable (e.g. special file), read it instead
+                return readhashfile(hashObjects, f, blockSize, limit)
+            with mapped, memoryview(mapped) as view:
+                # hash block-wise to release the GIL in between
+                for start in range(0, length, blockSize):
+                    block = view[start : start + blockSize]
+                    for hashObject in hashObjects:
+                        hashObject.update(block)
+                    block.release()
+            return hashObjects
+
+        return readhashfile(hashObjects, f, blockSize, limit)
+
+
+def readhashfile(hashObjects, f, blockSize=DEFAULTBLOCKSIZE, limit=None):
+    """Update all hash objects in the list with the content read from the open
+    binary file, optionally only up to limit bytes, and return the list.
+    """
+    view = memoryview(bytearray(blockSize))
+    remaining = limit
+    while remaining is None or remaining > 0:
+        if remaining is not None and remaining < blockSize:
+            count = f.readinto(view[:remaining])
+        else:
+            count = f.readinto(view)
+        if not count:
+            break
+        block = view[:count]
+        for hashObject in hashObjects:
+            hashObject.update(block)
+        block.release()
+        if remaining is not None:
+            remaining -= count
+    return hashObjects
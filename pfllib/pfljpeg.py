@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Module with a JPEG header reader. The image size is read from the start of
+frame segment, skipping all segments before it, without decoding the image.
+"""
+
+# standard imports
+import struct
+
+# start of frame markers (all but DHT 0xC4, JPG 0xC8 and DAC 0xCC)
+SOFMARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# markers without a segment length (TEM, RST0-7, SOI)
+STANDALONEMARKERS = frozenset([0x01] + list(range(0xD0, 0xD9)))
+# start of scan and end of image, the image data follows without any size
+ENDMARKERS = frozenset([0xD9, 0xDA])
+
+
+def jpegsize(filename):
+    """Return the tuple (width, height) of the JPEG file, or None if the size
+    could not be read from the header.
+    """
+    with open(filename, "rb") as f:
+        return readjpegsize(f)
+
+
+def readjpegsize(f):
+    """Return the tuple (width, height) read from the header of the open JPEG
+    file, or None if no valid start of frame segment was found.
+    """
+    if f.read(2) != b"\xff\xd8":
+        return None
+
+    while True:
+        marker = readmarker(f)
+        if marker is None or marker in ENDMARKERS:
+            return None
+        if marker in STANDALONEMARKERS:
+            continue
+
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack(">H", header)[0]
+        if length < 2:
+            return None
+
+        if marker in SOFMARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:])
+            # height 0 is defined later in the image data (DNL segment)
+            if width == 0 or height == 0:
+                return None
+            return (width, height)
+
+        f.seek(length - 2, 1)
+
+
+def readmarker(f):
+    """Return the next marker read from the open JPEG file, or None if there is
+    no marker at the file position.
+    """
+    byte = f.read(1)
+    if byte != b"\xff":
+        return None
+    # a marker may be preceded by any number of fill bytes
+    while byte == b"\xff":
+        byte = f.read(1)
+    return byte[0] if byte else None
@@ -6,11 +6,27 @@ __license__ = "LGPL"
 __version__ = "0.2.0"
 __date__ = "07/15/2023"
 
-"""Classes in pflout handle the output to stdout or to a CSV writer file
+"""Classes in pflout handle the output to stdout, to a CSV writer file or to
+a JSON lines file
 """
 
 # standard imports
 import csv
+import datetime
+import json
+import sys
+import time
+
+
+def jsonValue(value):
+    """Return the value as a string if not supported by JSON: bytes as hex,
+    dates and times in ISO format.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
 
 
 class PFLOut:
@@ -28,10 +44,53 @@ class PFLOut:
     def flushMatches(self):
         pass
 
+    def getStoredRow(self, dirPath, fileName):
+        """Return the data previously written for the file as dictionary, or None
+        if not available.
+        """
+        return None
+
+    def getStoredRows(self, dirPath):
+        """Return the data previously written for the files of the folder as
+        dictionary by file name, empty if not available.
+        """
+        return {}
+
+    def isDirUnchanged(self, dirPath, mtime, entries):
+        """Return true if the folder did not change since it was last written.
+        Must be thread-safe, as it is called from the scanning threads.
+        """
+        return False
+
+    def keepDir(self, dirPath, fileNames):
+        """Keep the previously written files of an unchanged folder, return false
+        if they could not all be kept.
+        """
+        return False
+
+    def writeDirInfo(self, dirPath, mtime, entries):
+        pass
+
+    def finishScan(self, recurse):
+        """Complete the output after all folders were scanned, not called if the
+        scan is interrupted.
+        """
+        pass
+
     def close(self):
         pass
 
 
+class PFLOutList(PFLOut):
+    """Class collecting the matches in a list (or deque), e.g. to be yielded."""
+
+    def __init__(self, matches):
+        self._matches = matches
+
+    def writeMatch(self, formattedList):
+        self._matches.append(formattedList)
+
+
 class PFLOutStd(PFLOut):
     """Class for result output to stdout."""
 
@@ -55,24 +114,72 @@ class PFLOutStd(PFLOut):
 
 
 class PFLOutFile(PFLOut):
-    """Class for result output to a file."""
+    """Class for result output to a file, or to stdout if the file path is None.
+    Rows are collected in a large buffer, which is flushed after a number of rows
+    or a time interval.
+    """
+
+    BUFFERSIZE = 1024 * 1024
 
-    def __init__(self, filePath, columnNames):
+    def __init__(self, filePath, columnNames, flushRows=1000, flushInterval=1.0):
         self._filePath = filePath
         self._columnNames = columnNames
+        self._outFile = None
+        self._flushRows = flushRows
+        self._flushInterval = flushInterval
+        self._countUnflushed = 0
+        self._flushTime = 0
+
+    def openfile(self, mode, encoding=None, errors=None):
+        if self._filePath is None:
+            # own buffered writer on the original stdout, as sys.stdout is
+            # redirected to the status messages stream while running
+            self._outFile = open(
+                sys.__stdout__.fileno(),
+                "w",
+                buffering=self.BUFFERSIZE,
+                encoding=encoding,
+                errors=errors,
+                newline="",
+                closefd=False,
+            )
+        else:
+            self._outFile = open(
+                self._filePath,
+                mode,
+                buffering=self.BUFFERSIZE,
+                encoding=encoding,
+                errors=errors,
+                newline="",
+            )
+
+    def countRow(self):
+        """Count a row written to the buffer, flush the buffer if due."""
+        self._countUnflushed += 1
+        if self._countUnflushed >= self._flushRows or (
+            time.monotonic() >= self._flushTime
+        ):
+            self.flushMatches()
+
+    def flushMatches(self):
+        """Write all buffered rows to the file."""
+        self._outFile.flush()
+        self._countUnflushed = 0
+        self._flushTime = time.monotonic() + self._flushInterval
+
+    def close(self):
+        if self._outFile is not None:
+            self._outFile.close()
 
 
 class PFLOutCSV(PFLOutFile):
     """Class for result output to CSV file."""
 
-    def __init__(self, filePath, columnNames):
-        super().__init__(filePath, columnNames)
-        self._outFile = None
-
     def openout(self, mode):
-        self._outFile = open(self._filePath, mode, newline="")
+        self.openfile(mode)
         self._csvWriter = csv.writer(self._outFile, dialect="excel-tab", delimiter=";")
         self._csvWriter.writerow(self._columnNames)
+        self.flushMatches()
 
     def writeMatch(self, formattedList):
         """Write result data as a new line into CSV file."""
@@ -81,8 +188,24 @@ class PFLOutCSV(PFLOutFile):
         except (Exception):
             # handle invalid chars or invalidly encoded chars
             self._csvWriter.writerow(["Error in output encoding!"])
-        self._outFile.flush()
+        self.countRow()
 
-    def close(self):
-        if self._outFile is not None:
-            self._outFile.close()
+
+class PFLOutJSONL(PFLOutFile):
+    """Class for result output to a JSON lines file, one object per match with
+    the column names as keys and the complete values.
+    """
+
+    def openout(self, mode):
+        # undecodable chars of file names are written as JSON escapes
+        self.openfile(mode, "utf-8", "backslashreplace")
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=jsonValue
+        ).encode
+
+    def writeMatch(self, formattedList):
+        """Write result data as a JSON object in a new line."""
+        self._outFile.write(
+            self._encode(dict(zip(self._columnNames, formattedList))) + "\n"
+        )
+        self.countRow()
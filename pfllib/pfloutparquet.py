@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLOutParquet handles the output to a Parquet file with typed columns
+(requires pyarrow). The rows are collected and written a row group at a time.
+"""
+
+# standard imports
+import datetime
+
+# 3rd party imports (optional)
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# local imports
+import pfllib.pflout as pflout
+
+
+def isAvailable():
+    """Return true if pyarrow is installed."""
+    return pyarrow is not None
+
+
+# Arrow types of the columns by name, columns starting with "hash" are binary
+# and all other columns strings
+COLUMNTYPES = {
+    "size": "int64",
+    "ctime": "timestamp",
+    "wtime": "timestamp",
+    "length": "float64",
+    "bitrate": "float64",
+    "track": "int64",
+    "year": "int64",
+    "width": "int64",
+    "height": "int64",
+    "dupgroup": "int64",
+    "inode": "int64",
+    "links": "int64",
+}
+
+
+def getArrowType(columnName):
+    """Return the Arrow type declared for the column name."""
+    typeName = COLUMNTYPES.get(
+        columnName, "binary" if columnName.startswith("hash") else "string"
+    )
+    if typeName == "timestamp":
+        return pyarrow.timestamp("us")
+    return getattr(pyarrow, typeName)()
+
+
+def getArrowValue(value, arrowType):
+    """Return the value converted to the Arrow type of its column, None if it
+    can not be converted (e.g. the empty string of an error row).
+    """
+    if value is None:
+        return None
+    if arrowType == pyarrow.string():
+        return value if isinstance(value, str) else pflout.jsonValue(value)
+    if arrowType == pyarrow.binary():
+        return value if isinstance(value, (bytes, bytearray)) else None
+    if pyarrow.types.is_timestamp(arrowType):
+        return value if isinstance(value, datetime.datetime) else None
+    try:
+        if arrowType == pyarrow.float64():
+            return float(value)
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PFLOutParquet(pflout.PFLOutFile):
+    """Class for result output to a Parquet file. The column types are declared
+    by the column names (see COLUMNTYPES), values of string columns which are no
+    strings are written as by the JSON lines output.
+    """
+
+    ROWGROUPSIZE = 65536
+
+    def __init__(self, filePath, columnNames, rowGroupSize=ROWGROUPSIZE):
+        super().__init__(filePath, columnNames)
+        self._rowGroupSize = rowGroupSize
+        self._rows = []
+        self._schema = None
+        self._writer = None
+
+    def openout(self, mode):
+        self._schema = pyarrow.schema(
+            [(name, getArrowType(name)) for name in self._columnNames]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(str(self._filePath), self._schema)
+
+    def writeMatch(self, formattedList):
+        self._rows.append(formattedList)
+        if len(self._rows) >= self._rowGroupSize:
+            self.flushMatches()
+
+    def flushMatches(self):
+        """Write the collected rows as a row group."""
+        if not self._rows:
+            return
+
+        columns = list(zip(*self._rows))
+        self._rows = []
+        arrays = [
+            pyarrow.array(
+                [getArrowValue(value, field.type) for value in values], type=field.type
+            )
+            for values, field in zip(columns, self._schema)
+        ]
+        self._writer.write_table(
+            pyarrow.Table.from_arrays(arrays, schema=self._schema),
+            row_group_size=self._rowGroupSize,
+        )
+
+    def close(self):
+        try:
+            self.flushMatches()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
@@ -20,33 +20,89 @@ import pfllib.pfsql as pfsql
 class PFLOutSqlite(pflout.PFLOutFile):
     """Class handles output of matching file search results to SQLite database."""
 
-    def __init__(self, filePath, columnNames, basePath):
-        super().__init__(filePath, columnNames)
+    # pragmas and default number of files per commit (0 for one transaction per
+    # run) of the settings profiles
+    PROFILES = {
+        "default": ([], 50),
+        "fast": (
+            [
+                ("journal_mode", "WAL"),
+                ("synchronous", "NORMAL"),
+                ("cache_size", "-65536"),
+                ("mmap_size", "268435456"),
+                ("temp_store", "MEMORY"),
+            ],
+            0,
+        ),
+    }
+
+    def __init__(
+        self,
+        filePath,
+        columnNames,
+        basePath,
+        tableName="filelist",
+        profile="default",
+        pragmas=None,
+        commitRows=None,
+        raiseErrors=False,
+    ):
+        # copy the column names, they are extended for the database table
+        super().__init__(filePath, list(columnNames))
+        self._dataColumns = columnNames[1:]
+        self._tableName = tableName
         self._db = None
+        self._profile = profile
+        profilePragmas, profileCommitRows = self.PROFILES[profile]
+        self._pragmas = profilePragmas + (pragmas or [])
+        self._commitRows = profileCommitRows if commitRows is None else commitRows
+        self._countUncommitted = 0
+        # write errors stop the run (in the writer thread), otherwise printed only
+        self._raiseErrors = raiseErrors
+        # the stats row ID of the run, written to the files and kept folders
+        self._runID = None
         self._basePath = str(basePath).rstrip("\\")
         self._basePathLen = len(self._basePath)
 
-        self._columnNames.append("status")
-        self._pqmarks = "=?, ".join(self._columnNames) + "=?"
-        self._updateCmd = f"UPDATE filelist SET {self._pqmarks} WHERE id=?"
+        self._columnNames.extend(["status", "runid"])
+        # insert new files with status "1", on conflict with a stored file update
+        # its data and run ID and set status "0" (name the columns, as added
+        # columns may be in a different order)
+        self._upsertCmd = (
+            f"INSERT INTO {tableName}({', '.join(self._columnNames)})"
+            + f" VALUES ({(len(self._columnNames) * '?, ').strip(', ')})"
+            + " ON CONFLICT(path, filename) DO UPDATE SET "
+            + ", ".join(
+                [f"{column}=excluded.{column}" for column in columnNames[2:]]
+                + ["status=0", "runid=excluded.runid"]
+            )
+        )
 
         self._columnNames.append("id")
-        self._qmarks = (len(self._columnNames) * "?, ").strip(", ")
-        self._insertCmd = f"INSERT INTO filelist VALUES ({self._qmarks})"
 
     def openout(self, mode):
         """Open the SQLite database file and set up the required tables."""
         self._db = pfsql.opendb(self._filePath)
+        pfsql.setpragmas(self._db, self._pragmas)
 
         if mode == "w":
             self.droptables()
 
+        self._dirIDs = {}
         self.setuptables()
 
         self._currentPath = None
         self._dataSets = []
+        self._storedPath = None
+        self._storedRows = {}
+        self._dirInfos = []
 
     def droptables(self):
+        if self._tableName != "filelist":
+            # other result tables are kept next to the file list, drop only them
+            pfsql.droptable(self._db, self._tableName, True)
+            return
+
         try:
             pfsql.droptable(self._db, "stats", True)
             # drop filelist table first as it references dirlist
@@ -56,40 +112,64 @@ class PFLOutSqlite(pflout.PFLOutFile):
             print("Error while clearing existing data tables (check recommended)!?")
 
     def setuptables(self):
-        pfsql.createtable(
-            self._db, "dirlist", ["id INTEGER PRIMARY KEY", "path type UNIQUE"], True
-        )
+        dirColumns = [
+            "id INTEGER PRIMARY KEY",
+            "path type UNIQUE",
+            "mtime",
+            "entries",
+            "runid",
+        ]
+        pfsql.createtable(self._db, "dirlist", dirColumns, True)
+        # add folder state columns to tables created by previous versions
+        pfsql.addmissingcolumns(self._db, "dirlist", dirColumns)
+        self.loaddirs()
         self._currentPathID = self.insertPath(self._basePath)
 
         self._columnNames[0] += " REFERENCES dirlist(id)"
         self._columnNames[-1] += " INTEGER PRIMARY KEY"
-        pfsql.createtable(
-            self._db, "filelist", self._columnNames, True, "UNIQUE(path, filename)"
-        )
-
-        # set all row's file status to -1 (=deleted)
-        pfsql.updaterow(self._db, "filelist", "status = ?", None, (-1,))
-
-    def writeStats(self, params):
-        """Create statistics table if not existing and append a new row."""
         pfsql.createtable(
             self._db,
-            "stats",
-            [
-                "id INTEGER PRIMARY KEY",
-                "timestamp",
-                "scanpath",
-                "pattern",
-                "recurse",
-                "filecount",
-                "duration",
-            ],
+            self._tableName,
+            self._columnNames,
             True,
+            "UNIQUE(path, filename)",
         )
-        self._statrowID = pfsql.insertidrow(
+        pfsql.addmissingcolumns(self._db, self._tableName, self._columnNames)
+
+    def loaddirs(self):
+        """Load the row IDs of all folders and the stored (mtime, entries) of the
+        folders written before, so folders need no lookup while writing.
+        """
+        self._dirStates = {}
+        for rowID, path, mtime, entries in self._db[1].execute(
+            "SELECT id, path, mtime, entries FROM dirlist"
+        ):
+            self._dirIDs[path] = rowID
+            if mtime is not None:
+                self._dirStates[path] = (mtime, entries)
+
+    def writeStats(self, params, statsInfo=None):
+        """Create statistics table if not existing and append a new row,
+        optionally with additional columns from the statsInfo dictionary.
+        The database settings used are added as well.
+        """
+        statsInfo = dict(statsInfo or {}, dbsettings=self.getSettingsInfo())
+        statsColumns = [
+            "id INTEGER PRIMARY KEY",
+            "timestamp",
+            "scanpath",
+            "pattern",
+            "recurse",
+            "filecount",
+            "duration",
+        ] + list(statsInfo)
+        pfsql.createtable(self._db, "stats", statsColumns, True)
+        pfsql.addmissingcolumns(self._db, "stats", statsColumns)
+
+        self._statrowID = self._runID = pfsql.insertidrow(
             self._db,
             "stats",
-            (7 * "?, ").strip(", "),
+            (len(statsColumns) * "?, ").strip(", "),
             (
                 None,
                 datetime.now(),
@@ -98,38 +178,119 @@ class PFLOutSqlite(pflout.PFLOutFile):
                 params.Recurse,
                 None,
                 None,
-            ),
+            )
+            + tuple(statsInfo.values()),
+            [column.split()[0] for column in statsColumns],
         )
 
+    def getSettingsInfo(self):
+        """Return a string with the profile, the values of its pragmas and of the
+        pragmas set in addition, and the number of files per commit.
+        """
+        settings = [f"profile={self._profile}"]
+        for name in dict(self._pragmas):
+            settings.append(f"{name}={pfsql.getpragma(self._db, name)}")
+        settings.append(f"commit_rows={self._commitRows}")
+        return ", ".join(settings)
+
     def writeMatch(self, formattedList):
         if not formattedList[0] == self._currentPath:
             self._currentPathID = self.insertPath(
-                str(formattedList[0])[self._basePathLen + 1 :]
+                self.relativePath(formattedList[0])
             )
             self._currentPath = formattedList[0]
 
-        fileID = pfsql.getrowid(
-            self._db,
-            "filelist",
-            f"path={self._currentPathID} AND filename='{formattedList[1]}'",
-        )
-
         formattedList[0] = self._currentPathID
-
-        if fileID is None:
-            # append status "1" for new file and None for empty ID
-            formattedList.extend([1, None])
-            self._dataSets.append([-1, formattedList])
-        else:
-            # append status "0" for previously existing file and its ID
-            formattedList.extend([0, fileID[0]])
-            self._dataSets.append([fileID[0], formattedList])
+        # append status "1" for a new file (the upsert sets "0" for existing ones)
+        # and the run ID
+        formattedList.extend([1, self._runID])
+        self._dataSets.append(formattedList)
 
         if len(self._dataSets) == 50:
             self.executeInsertUpdateFiles()
 
     def flushMatches(self):
-        if len(self._dataSets) > 0:
+        if len(self._dataSets) > 0 or len(self._dirInfos) > 0:
+            self.executeInsertUpdateFiles()
+
+    def getStoredRows(self, dirPath):
+        """Return a dictionary of the data columns (except path) stored for the
+        files of the folder by file name.
+        """
+        pathID = self._dirIDs.get(self.relativePath(dirPath))
+        if pathID is None:
+            return {}
+
+        res = self._db[1].execute(
+            f"SELECT {', '.join(self._dataColumns)} FROM {self._tableName}"
+            + " WHERE path = ?",
+            (pathID,),
+        )
+        return {row[0]: dict(zip(self._dataColumns, row)) for row in res}
+
+    def getStoredRow(self, dirPath, fileName):
+        """Return a dictionary with the data columns (except path) stored for
+        the file, or None if not existing. The rows are read folder by folder.
+        """
+        if dirPath != self._storedPath:
+            self._storedPath = dirPath
+            self._storedRows = self.getStoredRows(dirPath)
+
+        return self._storedRows.get(fileName)
+
+    def finishScan(self, recurse):
+        """Set status "-1" (deleted) for the files of the scanned folders which
+        were neither written nor kept in this run. Rows of unchanged files are
+        not rewritten.
+        """
+        if self._runID is None:
+            return
+
+        condition = (
+            "status != -1 AND runid IS NOT ?"
+            + " AND path NOT IN (SELECT id FROM dirlist WHERE runid = ?)"
+        )
+        params = (-1, self._runID, self._runID)
+        if not recurse:
+            condition += " AND path = ?"
+            params += (self._dirIDs.get(self.relativePath(self._basePath)),)
+        pfsql.updaterow(self._db, self._tableName, "status = ?", condition, params)
+
+    def isDirUnchanged(self, dirPath, mtime, entries):
+        """Return true if mtime and number of entries of the folder are the same
+        as written by the last run.
+        """
+        return self._dirStates.get(self.relativePath(dirPath)) == (mtime, entries)
+
+    def keepDir(self, dirPath, fileNames):
+        """Keep the folder's files as written before by marking the folder with
+        the run ID and resetting status "1" (new) to "0", return false if the
+        files in the database (not deleted) differ from them.
+        """
+        pathID = self.insertPath(self.relativePath(dirPath))
+        res = self._db[1].execute(
+            f"SELECT filename FROM {self._tableName} WHERE path = ? AND status != -1",
+            (pathID,),
+        )
+        if {fileName for fileName, in res} != set(fileNames):
+            return False
+
+        # only rows new in an earlier run change, the others are not rewritten
+        self._db[1].execute(
+            f"UPDATE {self._tableName} SET status = 0 WHERE path = ? AND status = 1",
+            (pathID,),
+        )
+        self._db[1].execute(
+            "UPDATE dirlist SET runid = ? WHERE id = ?", (self._runID, pathID)
+        )
+        return True
+
+    def writeDirInfo(self, dirPath, mtime, entries):
+        """Store the folder's mtime and number of entries with the next batch."""
+        self._dirInfos.append(
+            (mtime, entries, self.insertPath(self.relativePath(dirPath)))
+        )
+        if len(self._dirInfos) == 50:
             self.executeInsertUpdateFiles()
 
     def updateStats(self, countFiles, duration):
@@ -143,32 +304,47 @@ class PFLOutSqlite(pflout.PFLOutFile):
 
     def close(self):
         if self._db is not None:
-            pfsql.closedb(self._db)
+            try:
+                self._db[0].commit()
+            finally:
+                pfsql.closedb(self._db)
+
+    def relativePath(self, dirPath):
+        """Return the folder path relative to the base path as used in dirlist."""
+        return str(dirPath)[self._basePathLen + 1 :]
 
     def insertPath(self, newPath):
         """If not existing, insert a new path entry into the dirlist table,
         in any way, return its row ID.
         """
-        rowID = pfsql.getrowid(self._db, "dirlist", f"path='{newPath}'")
-
-        if rowID is not None:
-            return rowID[0]
+        rowID = self._dirIDs.get(newPath)
 
-        return pfsql.insertidrow(self._db, "dirlist", "?, ?", (None, newPath))
+        if rowID is None:
+            # committed with the next batch of files
+            self._db[1].execute("INSERT INTO dirlist(path) VALUES (?)", (newPath,))
+            rowID = self._db[1].lastrowid
+            self._dirIDs[newPath] = rowID
+        return rowID
 
     def executeInsertUpdateFiles(self):
         """Insert or update collection with new file datasets into table."""
         try:
-            inserts = [i for (rowID, i) in self._dataSets if rowID == -1]
-            updates = [i for (rowID, i) in self._dataSets if rowID != -1]
-
-            if len(inserts) > 0:
-                self._db[1].executemany(self._insertCmd, inserts)
-            if len(updates) > 0:
-                self._db[1].executemany(self._updateCmd, updates)
-            self._db[0].commit()
+            if len(self._dataSets) > 0:
+                self._db[1].executemany(self._upsertCmd, self._dataSets)
+            if len(self._dirInfos) > 0:
+                self._db[1].executemany(
+                    "UPDATE dirlist SET mtime = ?, entries = ? WHERE id = ?",
+                    self._dirInfos,
+                )
+            self._countUncommitted += len(self._dataSets)
+            if self._commitRows > 0 and self._countUncommitted >= self._commitRows:
+                self._db[0].commit()
+                self._countUncommitted = 0
         except Exception as e:
+            if self._raiseErrors:
+                raise
             # ignore invalid data
             print(e)
-            # pass
-        self._dataSets = []
+        finally:
+            self._dataSets = []
+            self._dirInfos = []
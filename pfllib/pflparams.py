@@ -13,6 +13,8 @@ and a file for result output, and additional attribute for stdout usage.
 
 # standard imports
 import pathlib
+import re
+import sys
 
 
 class PFLParams:
@@ -21,6 +23,9 @@ class PFLParams:
     and a file for result output, and additional attribute for stdout usage.
     """
 
+    # output file types by format
+    OUTFORMATS = {"csv": 0, "sqlite": 1, "jsonl": 2, "parquet": 3}
+
     def __init__(self, args, fixpattern=None):
         """Initialize the object from commandline arguments."""
         if fixpattern is None:
@@ -37,14 +42,35 @@ class PFLParams:
 
         self._ScanDir = args.scandir
         self._Recurse = args.recurse
+        self._Jobs = args.jobs
+        self._AsyncPipeline = args.asyncpipeline
+        # worker options are only provided by some tools
+        self._Workers = getattr(args, "workers", 0)
+        self._WorkerPool = getattr(args, "pool", "thread")
+        self._Ordered = getattr(args, "ordered", False)
+        # cache options are only provided by the media tools
+        self._CacheFile = getattr(args, "cache", None)
+        self._CacheSize = getattr(args, "cachesize", 0)
 
         self._OutFile = args.outfile
         self._UseStdOut = args.outfile is None
-        if not self._UseStdOut:
-            self._OutFileType = 0 if str(args.outfile).lower().endswith(".csv") else 1
-        else:
-            self._OutFileType = None
+        outFormat = args.format
+        if outFormat is None and not self._UseStdOut:
+            outFormat = {".csv": "csv", ".jsonl": "jsonl", ".parquet": "parquet"}.get(
+                pathlib.Path(args.outfile).suffix.lower(), "sqlite"
+            )
+        # None for text on stdout
+        self._OutFileType = self.OUTFORMATS.get(outFormat)
         self._OutExistsMode = args.overwrite + args.update
+        self._Incremental = (
+            args.incremental and self._OutExistsMode == "a" and self._OutFileType == 1
+        )
+        self._FlushRows = args.flushrows
+        self._FlushInterval = args.flushinterval
+        self._DbProfile = args.dbprofile
+        self._Pragmas = args.pragmas
+        self._CommitRows = args.commitrows
+        self._WriterThread = args.writerthread
         self._ShowDots = not self._UseStdOut and not args.nodots
         if self._ShowDots:
             self._FilesPerDot = pow(10, args.dots)
@@ -59,11 +85,25 @@ class PFLParams:
 
     Pattern = property(getPattern)
 
+    def getNamePattern(
+        self, doc="The fnmatch-usable match pattern for the file names to search for"
+    ):
+        return self._Pattern
+
+    NamePattern = property(getNamePattern)
+
     def getExclude(self, doc="A expression to exclude files/folders from listing"):
         return self._Exclude
 
     Exclude = property(getExclude)
 
+    def getExcludeRegex(
+        self, doc="The compiled exclude expression (None if nothing is excluded)"
+    ):
+        return self._ExcludeRegex
+
+    ExcludeRegex = property(getExcludeRegex)
+
     def getScanPath(self, doc="The path to the folder to scan for files"):
         return self._ScanPath
 
@@ -74,6 +114,43 @@ class PFLParams:
 
     Recurse = property(getRecurse)
 
+    def getJobs(self, doc="The number of threads used to scan folders"):
+        return self._Jobs
+
+    Jobs = property(getJobs)
+
+    def getAsyncPipeline(
+        self, doc="If true, scan, extraction and output run as a pipeline"
+    ):
+        return self._AsyncPipeline
+
+    AsyncPipeline = property(getAsyncPipeline)
+
+    def getWorkers(self, doc="The number of workers extracting the file data"):
+        return self._Workers
+
+    Workers = property(getWorkers)
+
+    def getWorkerPool(self, doc="The type of worker pool, 'thread' or 'process'"):
+        return self._WorkerPool
+
+    WorkerPool = property(getWorkerPool)
+
+    def getOrdered(self, doc="If true, results are written in scan order"):
+        return self._Ordered
+
+    Ordered = property(getOrdered)
+
+    def getCacheFilePath(self, doc="The path to the cache file (or None)"):
+        return self._CacheFilePath
+
+    CacheFilePath = property(getCacheFilePath)
+
+    def getCacheSize(self, doc="The maximum number of files kept in the cache"):
+        return self._CacheSize
+
+    CacheSize = property(getCacheSize)
+
     def getOutFilePath(self, doc="Determines the filename of the output file"):
         return self._OutFilePath
 
@@ -89,6 +166,18 @@ class PFLParams:
 
     OutFileType = property(getOutFileType)
 
+    def getStatusOut(
+        self, doc="Return the stream for status messages, stderr if stdout is used"
+        + " for records"
+    ):
+        return (
+            sys.stderr
+            if self._UseStdOut and self._OutFileType is not None
+            else sys.stdout
+        )
+
+    StatusOut = property(getStatusOut)
+
     def getOutExistsMode(
         self, doc="Defines the way an existing outfile will be handled"
     ):
@@ -96,6 +185,53 @@ class PFLParams:
 
     OutExistsMode = property(getOutExistsMode)
 
+    def getIncremental(
+        self, doc="If true, folders unchanged since the last update run are skipped"
+    ):
+        return self._Incremental
+
+    Incremental = property(getIncremental)
+
+    def getFlushRows(self, doc="The number of rows written to a file at a time"):
+        return self._FlushRows
+
+    FlushRows = property(getFlushRows)
+
+    def getFlushInterval(
+        self, doc="The maximum time in seconds rows are kept buffered"
+    ):
+        return self._FlushInterval
+
+    FlushInterval = property(getFlushInterval)
+
+    def getDbProfile(self, doc="The name of the SQLite settings profile"):
+        return self._DbProfile
+
+    DbProfile = property(getDbProfile)
+
+    def getDbPragmas(
+        self, doc="The list of (name, value) of SQLite pragmas set in addition"
+    ):
+        return self._DbPragmas
+
+    DbPragmas = property(getDbPragmas)
+
+    def getCommitRows(
+        self,
+        doc="The number of files written to a database per commit (0 for one"
+        + " transaction per run, None for the default of the profile)",
+    ):
+        return self._CommitRows
+
+    CommitRows = property(getCommitRows)
+
+    def getWriterThread(
+        self, doc="If true, write to the database in a dedicated thread"
+    ):
+        return self._WriterThread
+
+    WriterThread = property(getWriterThread)
+
     def getShowDots(
         self,
         doc="If true, stdout will display a dot for each matching file (when writing to file)",
@@ -122,6 +258,17 @@ class PFLParams:
                 "Invalid wildcards in directory '{0}'!".format(self._ScanDir)
             )
 
+        try:
+            self._ExcludeRegex = re.compile(self._Exclude) if self._Exclude else None
+        except re.error as e:
+            raise ValueError(
+                "Invalid exclude expression '{0}' ({1})!".format(self._Exclude, e)
+            )
+
+        self.checkNumbers()
+        self.checkOutFormat()
+        self._DbPragmas = self.parsePragmas(self._Pragmas)
+
         self.resolveScanPath(self._ScanDir)
 
         if not self._ScanPath.exists():
@@ -130,9 +277,55 @@ class PFLParams:
             raise NotADirectoryError("'{0}' is not a directory!".format(self._ScanPath))
 
         self.resolveOutFilePath(self._OutFile)
+        self._CacheFilePath = (
+            pathlib.Path(self._CacheFile).resolve()
+            if self._CacheFile is not None
+            else None
+        )
 
         return True
 
+    def checkNumbers(self):
+        """Check the numeric parameters and raise ValueError on any invalid."""
+        if self._Jobs < 1:
+            raise ValueError("Number of jobs must be at least 1!")
+
+        if self._FlushRows < 1:
+            raise ValueError("Number of rows to flush must be at least 1!")
+
+        if self._FlushInterval < 0:
+            raise ValueError("Flush interval must not be negative!")
+
+        if self._Workers < 0:
+            raise ValueError("Number of workers must not be negative!")
+
+        if self._CacheFile is not None and self._CacheSize < 1:
+            raise ValueError("Cache size must be at least 1 file!")
+
+        if self._CommitRows is not None and self._CommitRows < 0:
+            raise ValueError("Number of rows to commit must not be negative!")
+
+    def checkOutFormat(self):
+        """Check the output format and raise ValueError if not supported."""
+        if self._UseStdOut and self._OutFileType == 1:
+            raise ValueError("SQLite output requires an outfile!")
+
+        if self._OutFileType == 3:
+            if self._UseStdOut:
+                raise ValueError("Parquet output requires an outfile!")
+            if self._OutExistsMode == "a":
+                raise ValueError("Parquet files cannot be updated!")
+
+    def parsePragmas(self, pragmas):
+        """Return the list of (name, value) of the pragmas given as NAME=VALUE."""
+        parsed = []
+        for pragma in pragmas:
+            name, _, value = pragma.partition("=")
+            if not re.fullmatch(r"\w+", name) or not re.fullmatch(r"[\w.+-]+", value):
+                raise ValueError(f"Invalid pragma '{pragma}' (use NAME=VALUE)!")
+            parsed.append((name.lower(), value))
+        return parsed
+
     def resolveScanPath(self, scandir):
         self._ScanPath = (
             pathlib.Path.cwd() if scandir == "." else pathlib.Path(scandir).resolve()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLPipeline runs the scan of a PFLRun as an asyncio pipeline of four
+stages connected by bounded queues: the traversal and the extraction run in
+threads, the formatting on the event loop and all output calls in a writer
+thread. A slow stage fills its input queue and then blocks the stages before
+it, so memory stays bounded. Matches and output calls are passed on in
+batches to limit the hand-overs between the threads.
+"""
+
+# standard imports
+import asyncio
+import concurrent.futures
+import threading
+
+
+def passMatchList(dataList):
+    """Return the data list unchanged, it is formatted by the pipeline."""
+    return dataList
+
+
+class PFLOutPipe:
+    """Stands in for the output object of a run while the pipeline runs.
+    Matches are passed on to the formatting stage, all other calls to the output
+    stage in the order of the calls, waiting only for the results needed.
+    """
+
+    # calls only reading the state loaded on opening the output, done directly
+    DIRECTCALLS = frozenset(["isDirUnchanged"])
+    # calls with a result, which wait for all calls before
+    RESULTCALLS = frozenset(["getStoredRows", "keepDir"])
+
+    def __init__(self, pipeline, pflout, formatMatchList):
+        self._pipeline = pipeline
+        self._pflout = pflout
+        self._formatMatchList = formatMatchList
+        self._storedPath = None
+        self._storedRows = {}
+
+    def getOutput(self, doc="Return the output object of the run"):
+        return self._pflout
+
+    Output = property(getOutput)
+
+    def getFormatMatchList(self, doc="Return the format function of the run"):
+        return self._formatMatchList
+
+    FormatMatchList = property(getFormatMatchList)
+
+    def writeMatch(self, dataList):
+        self._pipeline.putOutput(
+            self._pflout.writeMatch, (dataList,), None, self._formatMatchList
+        )
+
+    def getStoredRow(self, dirPath, fileName):
+        """Return the data stored for the file, the stored rows are fetched from
+        the output stage once per folder.
+        """
+        if dirPath != self._storedPath:
+            self._storedRows = self._pipeline.callOutput(
+                self._pflout.getStoredRows, (dirPath,)
+            )
+            self._storedPath = dirPath
+        return self._storedRows.get(fileName)
+
+    def __getattr__(self, name):
+        func = getattr(self._pflout, name)
+        if name in self.DIRECTCALLS:
+            return func
+        if name in self.RESULTCALLS:
+            return lambda *args: self._pipeline.callOutput(func, args)
+        return lambda *args: self._pipeline.putOutput(func, args)
+
+
+class PFLPipeline:
+    """Run the traversal, extraction, formatting and output of a PFLRun
+    concurrently. The extraction uses the handleDir method of the run, which
+    may pass the matches on to the workers of the run as well.
+    """
+
+    FOLDERQUEUESIZE = 64
+    # number of output calls passed on at a time, and of batches queued
+    BATCHSIZE = 256
+    QUEUESIZE = 8
+
+    def __init__(self, run):
+        self._run = run
+        self._loop = None
+        self._stopped = False
+        self._batch = []
+        self._batchLock = threading.Lock()
+
+    def run(self, scanPath):
+        asyncio.run(self.main(scanPath))
+
+    async def main(self, scanPath):
+        self._loop = asyncio.get_running_loop()
+        self._folders = asyncio.Queue(self.FOLDERQUEUESIZE)
+        self._matches = asyncio.Queue(self.QUEUESIZE)
+        self._outputs = asyncio.Queue(self.QUEUESIZE)
+
+        stageExecutor = concurrent.futures.ThreadPoolExecutor(
+            2, thread_name_prefix="pflstage"
+        )
+        # a single thread keeps the order of the output calls
+        writeExecutor = concurrent.futures.ThreadPoolExecutor(
+            1, thread_name_prefix="pflwrite"
+        )
+        self._run.wrapOutput(
+            lambda pflout, formatMatchList: (
+                PFLOutPipe(self, pflout, formatMatchList),
+                passMatchList,
+            )
+        )
+        try:
+            stages = [
+                self._loop.run_in_executor(stageExecutor, self.traverse, scanPath),
+                self._loop.run_in_executor(stageExecutor, self.extract),
+                asyncio.ensure_future(self.format()),
+                asyncio.ensure_future(self.output(writeExecutor)),
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                # let the stage threads finish, then pass on the first error
+                self._stopped = True
+                for stage in stages:
+                    stage.cancel()
+                await asyncio.wait(stages)
+                raise
+        finally:
+            self._stopped = True
+            stageExecutor.shutdown()
+            writeExecutor.shutdown()
+            self._run.wrapOutput(lambda pipe, _: (pipe.Output, pipe.FormatMatchList))
+
+    def traverse(self, scanPath):
+        """Traversal stage: pass the folders found on to the extraction."""
+        for batch in self._run.scanFolders(scanPath):
+            self.putFromThread(self._folders, batch)
+        self.putFromThread(self._folders, None)
+
+    def extract(self):
+        """Extraction stage: handle the matching files of each folder."""
+        while True:
+            batch = self.waitFromThread(self._folders.get())
+            if batch is None:
+                break
+            self._run.handleDir(*batch)
+        self._run.finishMatches()
+        self.flushOutput()
+        self.putFromThread(self._matches, None)
+
+    async def format(self):
+        """Formatting stage: format the data lists of the matches."""
+        while True:
+            batch = await self._matches.get()
+            if batch is None:
+                await self._outputs.put(None)
+                return
+
+            calls = []
+            for func, args, future, formatMatchList in batch:
+                if formatMatchList is not None:
+                    args = (formatMatchList(args[0]),)
+                calls.append((func, args, future))
+            await self._outputs.put(calls)
+
+    async def output(self, writeExecutor):
+        """Output stage: do the output calls in the writer thread."""
+        while True:
+            calls = await self._outputs.get()
+            if calls is None:
+                return
+            await self._loop.run_in_executor(writeExecutor, self.callAll, calls)
+
+    def callAll(self, calls):
+        """Do the output calls, set the results of the ones waited for."""
+        for func, args, future in calls:
+            if future is None:
+                func(*args)
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def putOutput(self, func, args, future=None, formatMatchList=None):
+        """Add an output call to the batch passed on to the formatting stage."""
+        with self._batchLock:
+            self._batch.append((func, args, future, formatMatchList))
+            if len(self._batch) < self.BATCHSIZE and future is None:
+                return
+            batch = self._batch
+            self._batch = []
+        self.putFromThread(self._matches, batch)
+
+    def flushOutput(self):
+        """Pass the current batch of output calls on to the formatting stage."""
+        with self._batchLock:
+            batch = self._batch
+            self._batch = []
+        if batch:
+            self.putFromThread(self._matches, batch)
+
+    def callOutput(self, func, args):
+        """Pass an output call on to the output stage and return its result."""
+        future = concurrent.futures.Future()
+        self.putOutput(func, args, future)
+        return self.waitFuture(future)
+
+    def putFromThread(self, queue, item):
+        """Put the item into a queue, wait while the queue is full."""
+        self.waitFromThread(queue.put(item))
+
+    def waitFromThread(self, coroutine):
+        """Run the coroutine on the event loop and return its result."""
+        return self.waitFuture(asyncio.run_coroutine_threadsafe(coroutine, self._loop))
+
+    def waitFuture(self, future):
+        """Return the result of the future, raise CancelledError if the pipeline
+        is stopped before.
+        """
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except concurrent.futures.TimeoutError:
+                if self._stopped:
+                    future.cancel()
+                    raise concurrent.futures.CancelledError("Pipeline stopped!")
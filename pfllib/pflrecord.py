@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLMatch is the compact record of a matching file passed from the scan
+to the data extraction, instead of a pathlib.Path per file.
+"""
+
+
+class PFLMatch:
+    """Class PFLMatch describes a matching file by its parent folder path,
+    created once per folder and shared by all its files, its name and its full
+    path string (as given by os.scandir). It can be used like a path by open()
+    and the os functions, and str() returns the full path without a copy.
+    """
+
+    __slots__ = ("parent", "name", "path")
+
+    def __init__(self, parent, name, path):
+        self.parent = parent
+        self.name = name
+        self.path = path
+
+    def __fspath__(self):
+        return self.path
+
+    def __str__(self):
+        return self.path
+
+    def __repr__(self):
+        return f"PFLMatch({self.path!r})"
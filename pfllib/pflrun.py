@@ -12,7 +12,11 @@ handling each match by a virtual method.
 """
 
 # standard imports
-import glob
+import collections
+import concurrent.futures
+import contextlib
+import fnmatch
+import os
 import pathlib
 import re
 import sys
@@ -20,7 +24,73 @@ import time
 
 # local imports
 import pfllib.pflout as pflout
+import pfllib.pfloutparquet as pfloutparquet
 import pfllib.pfloutsqlite as pfloutsqlite
+import pfllib.pflpipeline as pflpipeline
+import pfllib.pflrecord as pflrecord
+import pfllib.pflscan as pflscan
+import pfllib.pflwriter as pflwriter
+
+# run object used by the extraction worker processes
+_workerRun = None
+
+
+def _initWorkerProcess(run):
+    global _workerRun
+    _workerRun = run
+
+
+def _getWorkerMatchDataList(match, stat):
+    return _workerRun.getMatchDataList(match, stat)
+
+
+def isPathPattern(pattern):
+    """Return true if the pattern has a folder part or "**"."""
+    return "/" in pattern or os.sep in pattern or "**" in pattern
+
+
+def translatePathPattern(pattern):
+    """Return a regular expression matching relative paths (with "/" separators)
+    as pathlib glob does: "**" matches any number of folders, other wildcards
+    match within a single path part.
+    """
+    parts = pattern.replace(os.sep, "/").split("/")
+    regex = ""
+    for partNo, part in enumerate(parts):
+        if part == "**" and partNo < len(parts) - 1:
+            regex += "(?:[^/]*/)*"
+            continue
+        regex += translatePathPart(part)
+        if partNo < len(parts) - 1:
+            regex += "/"
+    return regex + r"\Z"
+
+
+def translatePathPart(part):
+    """Return a regular expression for a single part of a path pattern, the
+    wildcards do not match "/".
+    """
+    regex = ""
+    pos = 0
+    while pos < len(part):
+        char = part[pos]
+        pos += 1
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and part.find("]", pos + 1) >= 0:
+            end = part.find("]", pos + 1)
+            chars = part[pos:end].replace("\\", "\\\\")
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            elif chars.startswith("^"):
+                chars = "\\" + chars
+            regex += f"[{chars}]"
+            pos = end + 1
+        else:
+            regex += re.escape(char)
+    return regex
 
 
 class PFLRun:
@@ -29,10 +99,25 @@ class PFLRun:
     handling each match by a virtual method.
     """
 
+    # name of the table written to a database output
+    OUTTABLE = "filelist"
+
     def __init__(self, params):
         self._params = params
         self._countFiles = 0
+        self._showDots = False
         self._columns = []
+        self._pool = None
+        self._pendingMatches = collections.deque()
+
+    def __getstate__(self):
+        """Return the state to pickle for extraction worker processes,
+        without output and worker pool.
+        """
+        state = self.__dict__.copy()
+        for key in ("_pflout", "_pool", "_pendingMatches"):
+            state.pop(key, None)
+        return state
 
     def getCountFiles(self, doc="Return the number of matching files found"):
         return self._countFiles
@@ -47,9 +132,17 @@ class PFLRun:
 
     Columns = property(getColumns, setColumns)
 
-    def Run(self, immediate=True):
-        """Run the file search."""
+    def Run(self, skipHidden=True):
+        """Run the file search. If skipHidden is true, files and folders starting
+        with a dot are ignored (as by glob).
+        """
+        # keep stdout for the records if they are written there
+        with contextlib.redirect_stdout(self._params.StatusOut):
+            self.runScan(skipHidden)
+
+    def runScan(self, skipHidden):
         self._countFiles = 0
+        self._showDots = self._params.ShowDots
 
         self.createpflout()
 
@@ -57,15 +150,9 @@ class PFLRun:
         startTime = time.time()
 
         try:
-            if not self._params.Exclude:
-                self._regexTest = self.regexNotMatch
-            else:
-                self._regexTest = self.regexFunc
-
-            if immediate:
-                self.matchFilesImmediate()
-            else:
-                self.matchFiles()
+            self.prepareScan(skipHidden)
+            self.matchFilesScandir()
+            self.finishScan()
 
             if self._params.ShowDots:
                 if self._countFiles < self._params.FilesPerDot:
@@ -79,17 +166,80 @@ class PFLRun:
         finally:
             duration = time.time() - startTime
 
-            # close outfile
-            if self._params.OutFileType == 1:
-                self._pflout.updateStats(self._countFiles, duration)
-            self._pflout.close()
+            self.closepflout(duration)
 
             print("Took {0:.2f} seconds.".format(duration))
 
-    def getMatchDataList(self, match):
-        """Return list with data from the match."""
+    def iterMatches(self, skipHidden=True):
+        """Yield the data list of each matching file, without any output or
+        printing. Closing the generator early stops the scan.
+        """
+        self._countFiles = 0
+        self._showDots = False
+        matches = collections.deque()
+        self._pflout = pflout.PFLOutList(matches)
+        self._formatMatchList = self.formatListRecord
+
+        self.prepareScan(skipHidden)
+        # there is no previous output to compare folders with
+        self._trackDirs = False
+
+        folders = self.scanFolders(self._params.ScanPath)
+        self.startWorkers()
+        try:
+            for dirPath, files, dirInfo in folders:
+                self.handleDir(dirPath, files, dirInfo)
+                while matches:
+                    yield matches.popleft()
+            self.finishMatches()
+            while matches:
+                yield matches.popleft()
+        finally:
+            folders.close()
+            self.stopWorkers()
+
+    def prepareScan(self, skipHidden):
+        """Set up the name and exclude matching used while scanning."""
+        if self._params.ExcludeRegex is None:
+            self._regexTest = self.regexNotMatch
+        else:
+            self._excludeSearch = self._params.ExcludeRegex.search
+            self._regexTest = self.regexFunc
+
+        self._skipHidden = skipHidden
+        # track folder modification times for SQLite output
+        self._trackDirs = self._params.OutFileType == 1
+        flags = re.IGNORECASE if os.name == "nt" else 0
+        pattern = self._params.NamePattern
+        # patterns with a folder part match the path relative to the scan path,
+        # and without recursion only the folders down to their depth are scanned
+        self._matchPath = isPathPattern(pattern)
+        if self._matchPath:
+            if self._params.Recurse:
+                pattern = "**/" + pattern
+            self._nameMatch = re.compile(translatePathPattern(pattern), flags).match
+            self._scanPath = str(self._params.ScanPath)
+        else:
+            self._nameMatch = re.compile(fnmatch.translate(pattern), flags).match
+        self._scanDepth = None
+        if not self._params.Recurse and "**" not in pattern:
+            self._scanDepth = pattern.replace(os.sep, "/").count("/")
+
+    def matchName(self, name):
+        """Return true if the file name matches the search pattern."""
+        return self._nameMatch(name) is not None
+
+    def getMatchDataList(self, match, stat):
+        """Return list with data from the match (a PFLMatch with parent path, name
+        and path string). The stat result of the file is passed along (None if
+        the file could not be stat'ed).
+        """
         return None
 
+    def formatListRecord(self, dataList):
+        """Return the data list unchanged, as yielded by iterMatches."""
+        return dataList
+
     def formatListStrings(self, dataList):
         """Return all elements in the list formatted as strings."""
         return [str(e) for e in dataList]
@@ -100,77 +250,359 @@ class PFLRun:
 
     def createpflout(self):
         """Create the output object for data storage."""
-        if self._params.UseStdOut:
+        if self._params.OutFileType is None:
             self._pflout = pflout.PFLOutStd()
             self._formatMatchList = self.formatListStrings
             return
-        
-        print("Write results to {}".format(self._params.OutFilePath))
-
-        if self._params.OutExistsMode == "":
-            if self._params.OutFilePath.exists():
-                inputres = input("Output file already exists. Overwrite (Y/n)?")
-                if inputres != "" and inputres != "Y" and inputres != "y":
-                    sys.exit(0)
-            overwrite = "w"
-        else:
-            overwrite = self._params.OutExistsMode
 
-        if self._params.OutFileType == 1:
+        outFileType = self._params.OutFileType
+        outFilePath = self._params.OutFilePath
+        if outFileType == 3 and not pfloutparquet.isAvailable():
+            outFileType = 0
+            outFilePath = outFilePath.with_suffix(".csv")
+            print("Parquet output requires pyarrow, write CSV file instead.")
+
+        overwrite = self.getOpenMode(outFilePath)
+
+        if outFileType == 1:
             self._pflout = pfloutsqlite.PFLOutSqlite(
-                self._params.OutFilePath, self._columns, self._params.ScanPath
+                outFilePath,
+                self._columns,
+                self._params.ScanPath,
+                self.OUTTABLE,
+                self._params.DbProfile,
+                self._params.DbPragmas,
+                self._params.CommitRows,
+                self._params.WriterThread,
             )
             self._formatMatchList = self.formatListDatabase
+        elif outFileType == 2:
+            self._pflout = pflout.PFLOutJSONL(
+                outFilePath,
+                self._columns,
+                self._params.FlushRows,
+                self._params.FlushInterval,
+            )
+            self._formatMatchList = self.formatListDatabase
+        elif outFileType == 3:
+            self._pflout = pfloutparquet.PFLOutParquet(outFilePath, self._columns)
+            self._formatMatchList = self.formatListDatabase
         else:
             self._pflout = pflout.PFLOutCSV(
-                self._params.OutFilePath,
+                outFilePath,
                 self._columns,
+                self._params.FlushRows,
+                self._params.FlushInterval,
             )
             self._formatMatchList = self.formatListStrings
 
+        # the pipeline writes in a thread of its own
+        if (
+            outFileType == 1
+            and self._params.WriterThread
+            and not self._params.AsyncPipeline
+        ):
+            self._pflout = pflwriter.PFLOutThread(self._pflout)
+
         self._pflout.openout(overwrite)
 
         if self._params.OutFileType == 1:
-            self._pflout.writeStats(self._params)
-
-    def matchFilesImmediate(self):
-        # use glob iterator to immediately handle results
-        # (does not return folders and files starting with dot!)
-        matchingFiles = glob.iglob(
-            f"{self._params.ScanPath}/{self._params.Pattern}",
-            recursive=True if self._params.Pattern.find("**") >= 0 else False,
+            self._pflout.writeStats(self._params, self.getStatsInfo())
+
+    def getOpenMode(self, outFilePath):
+        """Return the mode to open the outfile with. Ask the user before an
+        existing file is overwritten, unless the mode is given.
+        """
+        if self._params.UseStdOut:
+            return "w"
+
+        print("Write results to {}".format(outFilePath))
+
+        if self._params.OutExistsMode != "":
+            return self._params.OutExistsMode
+
+        if outFilePath.exists():
+            inputres = input("Output file already exists. Overwrite (Y/n)?")
+            if inputres != "" and inputres != "Y" and inputres != "y":
+                sys.exit(0)
+        return "w"
+
+    def getStatsInfo(self):
+        """Return a dictionary with additional run information for the
+        statistics of a database output.
+        """
+        return {}
+
+    def wrapOutput(self, wrap):
+        """Replace the output object and the format function by the ones returned
+        by wrap(output object, format function).
+        """
+        self._pflout, self._formatMatchList = wrap(
+            self._pflout, self._formatMatchList
         )
 
+    def closepflout(self, duration):
+        """Write the final statistics and close the output object."""
         try:
-            # go through the resulting file list and print results to stdout or file
-            for match in matchingFiles:
-                if self._regexTest(match):
-                    continue
-                matchPath = pathlib.Path(match)
-                if matchPath.is_file() and str(matchPath).find("$RECYCLE.BIN") == -1:
-                    matchDataList = self.getMatchDataList(matchPath)
-                    self._pflout.writeMatch(self._formatMatchList(matchDataList))
-                    self._countFiles += 1
-                    self.printdot()
+            if self._params.OutFileType == 1:
+                self._pflout.updateStats(self._countFiles, duration)
+        finally:
+            self._pflout.close()
+
+    def matchFilesScandir(self):
+        """Walk the scan path with os.scandir and handle each matching file.
+        The stat result cached by the directory entry is passed on to
+        getMatchDataList, so each file is stat'ed at most once.
+        """
+        self.startWorkers()
+        try:
+            if self._params.AsyncPipeline:
+                # scan, extract, format and write in concurrent stages
+                pflpipeline.PFLPipeline(self).run(self._params.ScanPath)
+            else:
+                # go through the matching files and print results to stdout or file
+                for dirPath, files, dirInfo in self.scanFolders(self._params.ScanPath):
+                    self.handleDir(dirPath, files, dirInfo)
+                self.finishMatches()
         finally:
-            self._pflout.flushMatches()
+            self.stopWorkers()
+            self.flushMatches()
+
+    def finishMatches(self):
+        """Complete the handling of all matches after the scan."""
+        self.writeDoneMatches(0)
+
+    def startWorkers(self):
+        """Create the pool of threads or processes extracting the match data."""
+        if self._params.Workers < 1:
+            return
+
+        if self._params.WorkerPool == "process":
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self._params.Workers,
+                initializer=_initWorkerProcess,
+                initargs=(self,),
+            )
+            self._getPoolMatchDataList = _getWorkerMatchDataList
+        else:
+            self._pool = concurrent.futures.ThreadPoolExecutor(self._params.Workers)
+            self._getPoolMatchDataList = self.getMatchDataList
+        # bound the number of files in work to keep memory limited
+        self._maxPending = 4 * self._params.Workers
+
+    def stopWorkers(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self._pendingMatches.clear()
+
+    def handleDir(self, dirPath, files, dirInfo):
+        """Handle the matching files of a folder. If the folder did not change
+        since the last update run, try to keep its files in the output instead.
+        """
+        if (
+            dirInfo is not None
+            and dirInfo[2]
+            and self._pflout.keepDir(dirPath, [entry.name for entry in files])
+        ):
+            self._countFiles += len(files)
+        else:
+            # one parent path object for all files of the folder
+            parent = pathlib.Path(dirPath)
+            for entry in files:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    stat = None
+                self.handleMatch(
+                    pflrecord.PFLMatch(parent, entry.name, entry.path), stat
+                )
+
+        if dirInfo is not None:
+            self._pflout.writeDirInfo(dirPath, dirInfo[0], dirInfo[1])
+
+    def handleMatch(self, match, stat):
+        """Extract the data of a matching file (by a worker if available)
+        and write it to the output.
+        """
+        if self._pool is None:
+            self.writeMatchData(self.getMatchDataList(match, stat))
+        else:
+            self.addPendingMatch(
+                self._pool.submit(self._getPoolMatchDataList, match, stat)
+            )
 
-    def matchFiles(self):
-        matchingFiles = self._params.ScanPath.glob(self._params.Pattern)
+    def addMatchData(self, matchDataList):
+        """Write already available match data to the output, behind the files
+        still in work if the output is ordered.
+        """
+        if self._pool is None or not self._params.Ordered:
+            self.writeMatchData(matchDataList)
+        else:
+            future = concurrent.futures.Future()
+            future.set_result(matchDataList)
+            self.addPendingMatch(future)
+
+    def addPendingMatch(self, future):
+        """Add the future of match data in work, and write the done matches
+        to keep the number of matches in work limited.
+        """
+        self._pendingMatches.append(future)
+        self.writeDoneMatches(self._maxPending)
 
+    def writeDoneMatches(self, maxPending):
+        """Write the data of all files done by the workers (in scan order if the
+        output is ordered), wait until no more than maxPending are left in work.
+        """
+        while True:
+            if self._params.Ordered:
+                pending = self._pendingMatches
+                while pending and pending[0].done():
+                    self.writeMatchData(pending.popleft().result())
+            else:
+                pending = collections.deque()
+                for future in self._pendingMatches:
+                    if future.done():
+                        self.writeMatchData(future.result())
+                    else:
+                        pending.append(future)
+                self._pendingMatches = pending
+
+            if len(pending) <= maxPending:
+                return
+            concurrent.futures.wait(
+                [pending[0]] if self._params.Ordered else pending,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+    def writeMatchData(self, matchDataList):
+        """Write the data of a matching file to the output."""
+        self._pflout.writeMatch(self._formatMatchList(matchDataList))
+        self._countFiles += 1
+        self.printdot()
+
+    def flushMatches(self):
+        """Write all pending matches to the output."""
+        self._pflout.flushMatches()
+
+    def finishScan(self):
+        """Complete the output after a scan of all folders, e.g. mark the files
+        not found anymore as deleted.
+        """
+        self._pflout.finishScan(self._params.Recurse)
+
+    def scanFolders(self, scanPath):
+        """Yield a tuple (folder path, matching file entries, folder info) for each
+        folder below scanPath (depth-first, a folder before its sub-folders).
+        With more than one job, folders are scanned by parallel threads in
+        no defined order, but the tuples are still yielded in the calling thread.
+        """
+        if str(scanPath).find("$RECYCLE.BIN") >= 0:
+            return
+
+        if self._params.Jobs > 1:
+            yield from pflscan.PFLParallelScan(
+                self.scanDirectory, self._params.Jobs
+            ).iterate(scanPath)
+            return
+
+        pendingDirs = [str(scanPath)]
+        while pendingDirs:
+            batch, subDirs = self.scanDirectory(pendingDirs.pop())
+            if batch is not None:
+                yield batch
+            pendingDirs.extend(reversed(subDirs))
+
+    def scanDirectory(self, dirPath):
+        """Scan a single directory and return a tuple with the folder batch
+        (None if there is nothing to report) and the list of sub-directory paths
+        to descend into. The batch is a tuple of the folder path, its matching
+        file entries and, if folders are tracked, a folder info tuple
+        (mtime, number of entries, unchanged since last update run).
+        """
         try:
-            # go through the resulting file list and print results to stdout or file
-            for match in matchingFiles:
-                if self._regexTest(str(match)):
+            if self._trackDirs:
+                dirMTime = os.stat(dirPath).st_mtime_ns
+            files, subDirs, countEntries = self.scanEntries(dirPath)
+        except OSError:
+            # skip folders without read permission (as glob does)
+            return None, []
+
+        dirInfo = None
+        if self._trackDirs:
+            dirInfo = (
+                dirMTime,
+                countEntries,
+                self._params.Incremental
+                and self._pflout.isDirUnchanged(dirPath, dirMTime, countEntries),
+            )
+
+        if self._params.Jobs > 1 and not (dirInfo is not None and dirInfo[2]):
+            for entry in files:
+                # fill the stat cache of the entry while still in the worker thread
+                try:
+                    entry.stat()
+                except OSError:
+                    pass
+
+        if not files and dirInfo is None:
+            return None, subDirs
+        return (dirPath, files, dirInfo), subDirs
+
+    def scanEntries(self, dirPath):
+        """Return a tuple with the list of matching file entries, the list of
+        sub-directory paths to descend into and the number of all entries.
+        """
+        files = []
+        subDirs = []
+        countEntries = 0
+        matchPrefix = self.getMatchPrefix(dirPath) if self._matchPath else ""
+        with os.scandir(dirPath) as entries:
+            for entry in entries:
+                countEntries += 1
+                if self._skipHidden and entry.name.startswith("."):
                     continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # prune excluded folders instead of filtering their files
+                        if self.isScanDir(entry):
+                            subDirs.append(entry.path)
+                    elif (
+                        self._nameMatch(matchPrefix + entry.name)
+                        and entry.is_file()
+                        and not self._regexTest(entry.path)
+                    ):
+                        files.append(entry)
+                except OSError:
+                    # entry vanished or is inaccessible
+                    continue
+        return files, subDirs, countEntries
+
+    def isScanDir(self, entry):
+        """Return true if the sub-directory entry is to be scanned."""
+        return (
+            (self._scanDepth is None or self.isPatternDir(entry.path))
+            and entry.name.find("$RECYCLE.BIN") == -1
+            and not self._regexTest(entry.path)
+        )
 
-                if match.is_file() and str(match).find("$RECYCLE.BIN") == -1:
-                    matchDataList = self.getMatchDataList(match)
-                    self._pflout.writeMatch(self._formatMatchList(matchDataList))
-                    self._countFiles += 1
-                    self.printdot()
-        finally:
-            self._pflout.flushMatches()
+    def isPatternDir(self, dirPath):
+        """Return true if the folder is within the depth of the folder part of
+        the pattern.
+        """
+        return (
+            self._scanDepth > 0
+            and os.path.relpath(dirPath, self._scanPath).count(os.sep) < self._scanDepth
+        )
+
+    def getMatchPrefix(self, dirPath):
+        """Return the folder path relative to the scan path as matched by a
+        pattern with folder part, with "/" separators.
+        """
+        relativePath = os.path.relpath(dirPath, self._scanPath)
+        if relativePath == ".":
+            return ""
+        return relativePath.replace(os.sep, "/") + "/"
 
     def regexNotMatch(self, filename):
         """Always return False. No files excluded."""
@@ -178,10 +610,23 @@ class PFLRun:
 
     def regexFunc(self, filename):
         """Return true if the filename does match the exclude regular expression.
-        In that case the file will not be included in the file listing.
+        In that case the file will not be included in the file listing, or the
+        folder will not be scanned.
         """
-        return re.search(self._params.Exclude, filename) is not None
+        return self._excludeSearch(filename) is not None
 
     def printdot(self):
-        if self._params.ShowDots and self._countFiles % self._params.FilesPerDot == 0:
+        if self._showDots and self._countFiles % self._params.FilesPerDot == 0:
             print(".", end="", flush=True)
+
+
+class PFLRunFileName(PFLRun):
+    """Derived class for scanning and storage of file path and name."""
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.Columns = ["path", "filename"]
+
+    def getMatchDataList(self, match, stat):
+        """Return list with data from the match."""
+        return [match.parent, match.name]
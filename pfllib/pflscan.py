@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLParallelScan walks a directory tree with a pool of worker threads.
+Each worker keeps its own deque of pending folders and steals from the other
+workers' deques when running idle.
+"""
+
+# standard imports
+import collections
+import queue
+import threading
+
+
+class PFLParallelScan:
+    """Walk a directory tree with a work-stealing pool of threads.
+    The folders are scanned by a scanDirectory function which returns a tuple
+    of a result batch (or None) and the list of sub-folders. The batches are
+    passed on to the iterating thread.
+    """
+
+    def __init__(self, scanDirectory, jobs, maxBatches=256):
+        self._scanDirectory = scanDirectory
+        self._jobs = jobs
+        self._deques = [collections.deque() for _ in range(jobs)]
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._batches = queue.Queue(maxBatches)
+        self._pending = 0
+        self._stopped = False
+        self._error = None
+
+    def iterate(self, scanPath):
+        """Yield the result batches of all folders below scanPath
+        in no defined order.
+        """
+        self._deques[0].append(str(scanPath))
+        self._pending = 1
+
+        workers = [
+            threading.Thread(target=self._work, args=(index,), daemon=True)
+            for index in range(self._jobs)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            finished = 0
+            while finished < self._jobs:
+                batch = self._batches.get()
+                if batch is None:
+                    finished += 1
+                else:
+                    yield batch
+
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.stop()
+            for worker in workers:
+                # unblock workers waiting to hand over their batch
+                while worker.is_alive():
+                    try:
+                        self._batches.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+    def stop(self):
+        """Make all workers finish after their current folder."""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+
+    def _work(self, index):
+        try:
+            while True:
+                dirPath = self._nextDir(index)
+                if dirPath is None:
+                    break
+
+                batch, subDirs = self._scanDirectory(dirPath)
+                if batch is not None:
+                    self._putBatch(batch)
+
+                with self._lock:
+                    self._deques[index].extend(subDirs)
+                    self._pending += len(subDirs) - 1
+                    if self._pending == 0 or len(subDirs) > 1:
+                        self._wakeup.notify_all()
+        except BaseException as e:
+            self._error = e
+            self.stop()
+        finally:
+            self._batches.put(None)
+
+    def _nextDir(self, index):
+        """Return the next folder to scan, preferably the most recently added
+        one of the own deque, otherwise the oldest one of another worker.
+        Return None when all folders are done or the scan was stopped.
+        """
+        with self._lock:
+            while True:
+                if self._stopped or self._pending == 0:
+                    return None
+                if self._deques[index]:
+                    return self._deques[index].pop()
+                for offset in range(1, self._jobs):
+                    victim = self._deques[(index + offset) % self._jobs]
+                    if victim:
+                        return victim.popleft()
+                self._wakeup.wait()
+
+    def _putBatch(self, batch):
+        while not self._stopped:
+            try:
+                self._batches.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                pass
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Class PFLOutThread runs all calls of an output object (e.g. PFLOutSqlite)
+in a dedicated writer thread, so the scan continues while the output writes
+and commits. The calls are passed on in batches through a bounded queue.
+"""
+
+# standard imports
+import concurrent.futures
+import queue
+import threading
+
+
+class PFLOutThread:
+    """Stands in for an output object and passes its calls on to the writer
+    thread owning it. Only calls with a result wait for the writer, an error
+    of the other calls is raised by the next call. Must be called from one
+    thread only.
+    """
+
+    # calls only reading the state loaded on opening the output, done directly
+    DIRECTCALLS = frozenset(["isDirUnchanged"])
+    # calls with a result, which wait for all calls before
+    RESULTCALLS = frozenset(["openout", "getStoredRows", "keepDir"])
+
+    # number of calls passed on at a time, and of batches queued
+    BATCHSIZE = 256
+    QUEUESIZE = 16
+
+    def __init__(self, pflout):
+        self._pflout = pflout
+        self._queue = queue.Queue(self.QUEUESIZE)
+        self._batch = []
+        self._error = None
+        self._storedPath = None
+        self._storedRows = {}
+        self._thread = threading.Thread(
+            target=self.writeCalls, name="pflwriter", daemon=True
+        )
+        self._thread.start()
+
+    def getOutput(self, doc="Return the output object written by the thread"):
+        return self._pflout
+
+    Output = property(getOutput)
+
+    def writeMatch(self, formattedList):
+        self.putCall(self._pflout.writeMatch, (formattedList,))
+
+    def flushMatches(self):
+        """Wait until all calls queued before are done."""
+        self.callOutput(self._pflout.flushMatches, ())
+
+    def close(self):
+        """Close the output in the writer thread and wait for the thread to end,
+        raise an error of the writer not raised yet.
+        """
+        future = concurrent.futures.Future()
+        self.putCall(self._pflout.close, (), future, False)
+        self.putBatch()
+        self._queue.put(None)
+        self._thread.join()
+        self.raiseError()
+        future.result()
+
+    def getStoredRow(self, dirPath, fileName):
+        """Return the data stored for the file, the stored rows are fetched from
+        the writer once per folder.
+        """
+        if dirPath != self._storedPath:
+            self._storedRows = self.callOutput(self._pflout.getStoredRows, (dirPath,))
+            self._storedPath = dirPath
+        return self._storedRows.get(fileName)
+
+    def __getattr__(self, name):
+        func = getattr(self._pflout, name)
+        if name in self.DIRECTCALLS:
+            return func
+        if name in self.RESULTCALLS:
+            return lambda *args: self.callOutput(func, args)
+        return lambda *args: self.putCall(func, args)
+
+    def callOutput(self, func, args):
+        """Pass a call on to the writer thread and return its result."""
+        future = concurrent.futures.Future()
+        self.putCall(func, args, future)
+        return future.result()
+
+    def putCall(self, func, args, future=None, checkError=True):
+        """Add a call to the batch, pass the batch on if full or the call has a
+        result to wait for.
+        """
+        if checkError:
+            self.raiseError()
+        self._batch.append((func, args, future))
+        if len(self._batch) >= self.BATCHSIZE or future is not None:
+            self.putBatch()
+
+    def putBatch(self):
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def raiseError(self):
+        """Raise the first error of a call without result, only once."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def writeCalls(self):
+        """Writer thread: do the calls until the end of the queue."""
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+
+            for func, args, future in batch:
+                try:
+                    result = func(*args)
+                except Exception as e:
+                    if future is not None:
+                        future.set_exception(e)
+                    elif self._error is None:
+                        self._error = e
+                    continue
+                if future is not None:
+                    future.set_result(result)
@@ -14,12 +14,27 @@ import sqlite3
 
 
 def opendb(dbFileName):
-    """Open a SQLite database file and return a tuple with connection and cursor object."""
-    connection = sqlite3.connect(dbFileName)
+    """Open a SQLite database file and return a tuple with connection and cursor object.
+    The connection may be used by another thread than the opening one, but only
+    by one thread at a time.
+    """
+    connection = sqlite3.connect(dbFileName, check_same_thread=False)
     cursor = connection.cursor()
     return (connection, cursor)
 
 
+def setpragmas(db, pragmas):
+    """Set the pragmas given as list of (name, value) for the database connection."""
+    for name, value in pragmas:
+        db[1].execute(f"PRAGMA {name}={value}")
+
+
+def getpragma(db, name):
+    """Return the current value of a pragma, or None if it has no value."""
+    row = db[1].execute(f"PRAGMA {name}").fetchone()
+    return row[0] if row is not None else None
+
+
 def tableexists(db, tableName):
     """Return true if tablename exists in the database."""
     selectCmd = (
@@ -66,6 +81,15 @@ def gettablecolnames(db, tablename):
     return [colname for colname, in res]
 
 
+def addmissingcolumns(db, tablename, columnNames):
+    """Add the columns to an existing table which it does not yet contain."""
+    existing = gettablecolnames(db, tablename)
+    for column in columnNames:
+        if column.split()[0] not in existing:
+            db[1].execute(f"ALTER TABLE {tablename} ADD COLUMN {column}")
+    db[0].commit()
+
+
 def getrowid(db, tablename, conditions):
     """Return the ID column value of the row matching the conditions clause or
     return None if no matching row exists.
@@ -78,20 +102,26 @@ def getrowid(db, tablename, conditions):
         return None
 
 
-def insertrow(db, tablename, parampattern, params, ifnotexists=False):
-    """Insert a new row into a table with the given values."""
+def insertrow(
+    db, tablename, parampattern, params, ifnotexists=False, columnNames=None
+):
+    """Insert a new row into a table with the given values, optionally only
+    into the named columns.
+    """
     if ifnotexists:
         ignore = "OR IGNORE "
     else:
         ignore = ""
+    if columnNames is not None:
+        tablename += "(" + ", ".join(columnNames) + ")"
     insertCmd = f"INSERT {ignore}INTO {tablename} VALUES ({parampattern})"
     db[1].execute(insertCmd, params)
     db[0].commit()
 
 
-def insertidrow(db, tablename, parampattern, params):
+def insertidrow(db, tablename, parampattern, params, columnNames=None):
     """Insert a row into a table with the given values and return the last row ID."""
-    insertrow(db, tablename, parampattern, params)
+    insertrow(db, tablename, parampattern, params, columnNames=columnNames)
     return db[1].lastrowid
 
 
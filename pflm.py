@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Scan a directory and its sub-directories only once, and create several file
+listings at a time (as the tools pfli, pflh, pflj, pfl3 and pfl4 would do),
+each printed to stdout or saved as a separate CSV or database file.
+"""
+
+# standard imports
+import argparse
+import importlib
+import os
+import sys
+
+# local imports
+import pfllib.pflparams as pflparams
+import pfllib.pflrun as pflrun
+from pflh import PFLArgParseWUserPatternAndLimit
+
+# tool letter: (module, params class (None=PFLParams), run class, include dot files)
+TOOLS = {
+    "i": ("pfli", None, "PFLRunFileInfo", True),
+    "h": ("pflh", "PFLParamsWithLimit", "PFLRunFileInfoWithSHA256", True),
+    "j": ("pflj", "PFLParamsJPG", "PFLRunJPG", False),
+    "3": ("pfl3", "PFLParamsMP3", "PFLRunMP3", False),
+    "4": ("pfl4", "PFLParamsMP4", "PFLRunMP4", False),
+}
+
+
+class PFLArgParseMulti(PFLArgParseWUserPatternAndLimit):
+    """Argument parser class adding the selection of tools to run."""
+
+    def __init__(self, description):
+        super().__init__(description)
+        self.add_argument(
+            "-t",
+            "--tools",
+            dest="tools",
+            type=str,
+            default="ihj34",
+            help="letters of the listings to create: i=pfli, h=pflh, j=pflj, "
+            + "3=pfl3, 4=pfl4 [default=ihj34]",
+        )
+        self.addCacheArguments()
+
+
+class PFLRunMulti(pflrun.PFLRun):
+    """Derived class scanning once and passing each matching file on to all
+    tool runs whose pattern matches.
+    """
+
+    def __init__(self, params, runs):
+        super().__init__(params)
+        # list of tuples (run, skipHidden)
+        self._runs = runs
+
+    def prepareScan(self, skipHidden):
+        """Set up all tool runs, the scan itself includes dot files if any of the
+        tool runs does.
+        """
+        for run, runSkipHidden in self._runs:
+            run.prepareScan(runSkipHidden)
+        super().prepareScan(all(runSkipHidden for _, runSkipHidden in self._runs))
+        self._nameMatch = self.matchAnyName
+        # folders are not tracked for the tool runs' outputs
+        self._trackDirs = False
+        self._scanPathLen = len(str(self._params.ScanPath))
+
+    def matchAnyName(self, name):
+        """Return true if the name matches the pattern of any of the tool runs."""
+        for run, _ in self._runs:
+            if run.matchName(name):
+                return True
+        return False
+
+    def createpflout(self):
+        for run, _ in self._runs:
+            run.createpflout()
+
+    def wrapOutput(self, wrap):
+        for run, _ in self._runs:
+            run.wrapOutput(wrap)
+
+    def closepflout(self, duration):
+        for run, _ in self._runs:
+            try:
+                print(
+                    "{0}: {1} matching file(s).".format(
+                        run.__class__.__name__, run.CountFiles
+                    )
+                )
+            finally:
+                run.closepflout(duration)
+
+    def handleMatch(self, match, stat):
+        """Pass the match on to each tool run whose pattern matches."""
+        relativePath = str(match)[self._scanPathLen + 1 :]
+        isHidden = relativePath.startswith(".") or (os.sep + ".") in relativePath
+
+        handled = False
+        for run, runSkipHidden in self._runs:
+            if run.matchName(match.name) and not (runSkipHidden and isHidden):
+                run.handleMatch(match, stat)
+                handled = True
+
+        if handled:
+            self._countFiles += 1
+            self.printdot()
+
+    def startWorkers(self):
+        for run, _ in self._runs:
+            run.startWorkers()
+
+    def stopWorkers(self):
+        for run, _ in self._runs:
+            run.stopWorkers()
+
+    def writeDoneMatches(self, maxPending):
+        for run, _ in self._runs:
+            run.writeDoneMatches(maxPending)
+
+    def flushMatches(self):
+        for run, _ in self._runs:
+            run.flushMatches()
+
+    def finishScan(self):
+        for run, _ in self._runs:
+            run.finishScan()
+
+
+def getTools(args):
+    """Return the list of tools to run, raise ValueError on unknown tools or
+    records of several listings written to stdout.
+    """
+    tools = list(dict.fromkeys(args.tools))
+    for tool in tools:
+        if tool not in TOOLS:
+            raise ValueError(f"Unknown tool '{tool}'!")
+
+    if args.outfile is None and args.format is not None:
+        raise ValueError("Several listings in a file format require an outfile!")
+    return tools
+
+
+def createToolRun(tool, args):
+    """Import the tool module and return a tuple with its run object (set up with
+    a separate outfile) and whether it skips dot files.
+    """
+    moduleName, paramsClassName, runClassName, withHidden = TOOLS[tool]
+    module = importlib.import_module(moduleName)
+
+    toolArgs = argparse.Namespace(**vars(args))
+    if args.outfile is not None:
+        toolArgs.outfile = args.outfile.with_name(
+            f"{args.outfile.stem}_{moduleName}{args.outfile.suffix}"
+        )
+    # dots are displayed for the combined run only
+    toolArgs.nodots = True
+
+    if paramsClassName is None:
+        params = pflparams.PFLParams(toolArgs)
+    else:
+        params = getattr(module, paramsClassName)(toolArgs)
+
+    return (getattr(module, runClassName)(params), not withHidden)
+
+
+def main():
+    # define and collect commandline arguments
+    # (kept outside try-catch block to leave exception messages untouched)
+    parser = PFLArgParseMulti(
+        description="Scan a directory and its sub-directories once, and create\n"
+        + "several file listings (pfli, pflh, pflj, pfl3, pfl4) at a time,\n"
+        + "printed to stdout, or saved as separate CSV or database files\n"
+        + "(named <outfile>_<tool>.<ext>)."
+    )
+    args = parser.parse_args()
+
+    try:
+        tools = getTools(args)
+
+        # create parameter object, the tool runs select their files themselves
+        params = pflparams.PFLParams(args, fixpattern="*")
+
+        runs = [createToolRun(tool, args) for tool in tools]
+
+        print(
+            "Search for files for {0} listing(s) in directory '{1}'...".format(
+                len(runs), params.ScanPath
+            ),
+            file=params.StatusOut,
+        )
+
+        run = PFLRunMulti(params, runs)
+
+        run.Run()
+    except (ValueError) as e:
+        print(f"Invalid parameter: {e.args[0]}", file=sys.stderr)
+    except (FileNotFoundError) as e:
+        print(f"Directory not found: {e.args[0]}", file=sys.stderr)
+    except (NotADirectoryError) as e:
+        print(f"Error: {e.args[0]}", file=sys.stderr)
+    except (ModuleNotFoundError) as e:
+        print(
+            f"Missing library: {e.name} (see README for requirements)", file=sys.stderr
+        )
+    except (KeyboardInterrupt):
+        print("Cancelled by user!", file=sys.stderr)
+    except (Exception) as e:
+        print("Unhandled error:", e.args[0], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
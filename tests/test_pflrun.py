@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+__author__ = "Michael Heise"
+__copyright__ = "Copyright (C) 2023 by Michael Heise"
+__license__ = "LGPL"
+__version__ = "0.1.0"
+__date__ = "10/18/2026"
+
+"""Tests of the file matching of PFLRun."""
+
+# standard imports
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+# local imports
+import pfllib.pflapi as pflapi  # noqa: E402
+import pfllib.pflargparse as pflargparse  # noqa: E402
+import pfllib.pflparams as pflparams  # noqa: E402
+
+FILES = ["r.txt", "a/1.txt", "a/2.txt", "a/x/3.txt", "b/4.txt", "b/5.log"]
+
+
+class TestPatternMatching(unittest.TestCase):
+    """Scan a small folder tree with name patterns and patterns with folder part."""
+
+    def setUp(self):
+        self._tempDir = tempfile.TemporaryDirectory()
+        self._scanPath = pathlib.Path(self._tempDir.name)
+        for file in FILES:
+            (self._scanPath / file).parent.mkdir(parents=True, exist_ok=True)
+            (self._scanPath / file).touch()
+
+    def tearDown(self):
+        self._tempDir.cleanup()
+
+    def scanFiles(self, *args):
+        """Return the sorted relative paths of the files matching the arguments."""
+        parser = pflargparse.PFLArgParseWUserPattern(description="pfl")
+        params = pflparams.PFLParams(
+            parser.parse_args(list(args) + [str(self._scanPath)])
+        )
+        return sorted(
+            (record.path / record.filename).relative_to(self._scanPath).as_posix()
+            for record in pflapi.scan(params)
+        )
+
+    def test_name_pattern(self):
+        self.assertEqual(self.scanFiles("*.txt"), ["r.txt"])
+        self.assertEqual(
+            self.scanFiles("-r", "*.txt"),
+            ["a/1.txt", "a/2.txt", "a/x/3.txt", "b/4.txt", "r.txt"],
+        )
+
+    def test_folder_pattern(self):
+        self.assertEqual(self.scanFiles("a/*.txt"), ["a/1.txt", "a/2.txt"])
+        self.assertEqual(self.scanFiles("*/*.txt"), ["a/1.txt", "a/2.txt", "b/4.txt"])
+        self.assertEqual(
+            self.scanFiles("-r", "*/*.txt"),
+            ["a/1.txt", "a/2.txt", "a/x/3.txt", "b/4.txt"],
+        )
+
+    def test_recursive_pattern(self):
+        self.assertEqual(
+            self.scanFiles("**/*.txt"),
+            ["a/1.txt", "a/2.txt", "a/x/3.txt", "b/4.txt", "r.txt"],
+        )
+        self.assertEqual(
+            self.scanFiles("a/**/*.txt"), ["a/1.txt", "a/2.txt", "a/x/3.txt"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()